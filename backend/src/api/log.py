@@ -8,8 +8,13 @@ from typing import Dict, Optional
 
 from utils.logger import StructuredLogger
 
-# Valid log levels
-VALID_LOG_LEVELS = {"ERROR", "WARNING", "INFO", "DEBUG"}
+# Valid log levels. A frozenset: the membership test runs on every log
+# submission and nothing should ever add to it at runtime.
+VALID_LOG_LEVELS = frozenset({"ERROR", "WARNING", "INFO", "DEBUG"})
+
+# The rejection text, built once and in a fixed order. Joining the set itself
+# listed the levels in hash order, which varies between processes.
+_VALID_LEVELS_TEXT = ", ".join(("ERROR", "WARNING", "INFO", "DEBUG"))
 
 
 def handle_log(
@@ -33,22 +38,30 @@ def handle_log(
     level = body.get("level", "").upper()
     message = body.get("message", "")
 
-    # Validate required fields
-    if not level:
-        raise ValueError("Field 'level' is required")
-
-    if not message:
-        raise ValueError("Field 'message' is required")
-
-    # Validate log level
-    if level not in VALID_LOG_LEVELS:
-        raise ValueError(
-            f"Invalid log level '{level}'. Must be one of: {', '.join(VALID_LOG_LEVELS)}"
-        )
+    # Validate required fields. The common case -- a known level and a
+    # message -- passes on a single branch; the specific errors are only
+    # worked out once that has already failed.
+    if level not in VALID_LOG_LEVELS or not message:
+        if not level:
+            raise ValueError("Field 'level' is required")
+        if not message:
+            raise ValueError("Field 'message' is required")
+        raise ValueError(f"Invalid log level '{level}'. Must be one of: {_VALID_LEVELS_TEXT}")
 
     # Extract optional fields
     stack = body.get("stack")
-    metadata = body.get("metadata", {})
+    metadata = body.get("metadata")
+
+    # The metadata dict is the one set of fields handed to the logger: ip and
+    # stack are added to it in place rather than merged into a new dict. The
+    # endpoint has already replaced the client's dict with its own sanitized
+    # copy, so writing into it touches nothing the caller still holds.
+    if metadata is None:
+        metadata = {}
+    elif not isinstance(metadata, dict):
+        # A list or string here used to fail on the item assignment below as a
+        # TypeError, which the endpoint answered with a 500.
+        raise ValueError("Field 'metadata' must be an object")
 
     # Add IP address to metadata
     metadata["ip"] = ip_address
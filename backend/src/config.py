@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import warnings
+from collections.abc import Mapping
 from dataclasses import dataclass
 
 
@@ -359,51 +360,59 @@ firefly_client_id = os.environ.get("FIREFLY_CLIENT_ID", "")
 firefly_client_secret = os.environ.get("FIREFLY_CLIENT_SECRET", "")
 
 # 4 Fixed Models Configuration
-_gemini_api_key = os.environ.get("GEMINI_API_KEY", "")
-_openai_api_key = os.environ.get("OPENAI_API_KEY", "")
-
-MODELS: dict[str, ModelConfig] = {
-    "gemini": ModelConfig(
-        name="gemini",
-        provider="google_gemini",
-        enabled=(
-            os.environ.get("GEMINI_ENABLED", "true").lower() == "true" and bool(_gemini_api_key)
+
+
+def _load_models_from_env(env: Mapping[str, str]) -> dict[str, ModelConfig]:
+    """Build the four fixed model configs from an environment mapping.
+
+    A function of its argument alone, so the enable/credential rules can be
+    exercised with a plain dict instead of reloading this module. The module
+    calls it exactly once, with os.environ, to build MODELS.
+    """
+    gemini_api_key = env.get("GEMINI_API_KEY", "")
+    openai_api_key = env.get("OPENAI_API_KEY", "")
+
+    return {
+        "gemini": ModelConfig(
+            name="gemini",
+            provider="google_gemini",
+            enabled=env.get("GEMINI_ENABLED", "true").lower() == "true" and bool(gemini_api_key),
+            api_key=gemini_api_key,
+            model_id=env.get("GEMINI_MODEL_ID", "gemini-3.1-flash-image-preview"),
+            display_name="Gemini",
         ),
-        api_key=_gemini_api_key,
-        model_id=os.environ.get("GEMINI_MODEL_ID", "gemini-3.1-flash-image-preview"),
-        display_name="Gemini",
-    ),
-    "nova": ModelConfig(
-        name="nova",
-        provider="bedrock_nova",
-        enabled=os.environ.get("NOVA_ENABLED", "true").lower() == "true",
-        api_key="",  # Auth via IAM role
-        model_id=os.environ.get("NOVA_MODEL_ID", "amazon.nova-canvas-v1:0"),
-        display_name="Nova Canvas",
-    ),
-    "openai": ModelConfig(
-        name="openai",
-        provider="openai",
-        enabled=(
-            os.environ.get("OPENAI_ENABLED", "true").lower() == "true" and bool(_openai_api_key)
+        "nova": ModelConfig(
+            name="nova",
+            provider="bedrock_nova",
+            enabled=env.get("NOVA_ENABLED", "true").lower() == "true",
+            api_key="",  # Auth via IAM role
+            model_id=env.get("NOVA_MODEL_ID", "amazon.nova-canvas-v1:0"),
+            display_name="Nova Canvas",
         ),
-        api_key=_openai_api_key,
-        model_id=os.environ.get("OPENAI_MODEL_ID", "dall-e-3"),
-        display_name="DALL-E 3",
-    ),
-    "firefly": ModelConfig(
-        name="firefly",
-        provider="adobe_firefly",
-        enabled=(
-            os.environ.get("FIREFLY_ENABLED", "true").lower() == "true"
-            and bool(firefly_client_id)
-            and bool(firefly_client_secret)
+        "openai": ModelConfig(
+            name="openai",
+            provider="openai",
+            enabled=env.get("OPENAI_ENABLED", "true").lower() == "true" and bool(openai_api_key),
+            api_key=openai_api_key,
+            model_id=env.get("OPENAI_MODEL_ID", "dall-e-3"),
+            display_name="DALL-E 3",
         ),
-        api_key="",  # Auth via OAuth2 client credentials
-        model_id=os.environ.get("FIREFLY_MODEL_ID", "firefly-image-5"),
-        display_name="Firefly",
-    ),
-}
+        "firefly": ModelConfig(
+            name="firefly",
+            provider="adobe_firefly",
+            enabled=(
+                env.get("FIREFLY_ENABLED", "true").lower() == "true"
+                and bool(env.get("FIREFLY_CLIENT_ID", ""))
+                and bool(env.get("FIREFLY_CLIENT_SECRET", ""))
+            ),
+            api_key="",  # Auth via OAuth2 client credentials
+            model_id=env.get("FIREFLY_MODEL_ID", "firefly-image-5"),
+            display_name="Firefly",
+        ),
+    }
+
+
+MODELS: dict[str, ModelConfig] = _load_models_from_env(os.environ)
 
 # CORS
 cors_allowed_origin = os.environ.get("CORS_ALLOWED_ORIGIN", "*")
@@ -639,6 +648,14 @@ image_download_timeout = _safe_int("IMAGE_DOWNLOAD_TIMEOUT", 30)
 enhance_timeout = min(_safe_float("ENHANCE_TIMEOUT", 30.0), sync_dispatch_budget_seconds)
 generate_thread_workers = _safe_int("GENERATE_THREAD_WORKERS", 4)
 
+# Connection pool for the container's one S3 client, shared by the generation
+# and gallery thread pools. botocore's default pool holds 10 connections; each
+# generation thread and each gallery fetch can hold one at once, and a request
+# past the pool size still succeeds but opens -- and then discards -- a fresh
+# TLS connection. Sized from the pools that share it so raising
+# GENERATE_THREAD_WORKERS does not quietly reintroduce that.
+s3_pool_connections = max(10, generate_thread_workers + 4)
+
 # When true (the default), POST /generate answers the caller as soon as the
 # session exists and hands the provider dispatch to an asynchronous
 # self-invocation. When false, the handler runs the generation inline and
@@ -12,12 +12,37 @@ import random
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import TypedDict
+from typing import Any, TypedDict
 
 from botocore.exceptions import ClientError
 
 from config import MAX_ITERATIONS, MODELS
 
+# orjson when present, stdlib json otherwise. Every mutation reads and writes
+# the whole status document -- four provider threads, two writes each, plus
+# whatever the retry loop re-reads on a conflict -- so encode/decode is on the
+# path of every transition. orjson returns bytes, which is what put_object
+# sends anyway; the fallback keeps a checkout without the wheel working, and
+# both emit JSON any reader (the frontend, the e2e suite, a human with the S3
+# console) parses identically.
+try:
+    import orjson
+
+    def _dumps(status: SessionState) -> bytes:
+        return orjson.dumps(status)
+
+    def _loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+except ImportError:  # pragma: no cover - exercised only without the wheel
+
+    def _dumps(status: SessionState) -> bytes:
+        return json.dumps(status).encode("utf-8")
+
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
+
 # Attempts at the conditional write before giving up. Was 3, which is thin
 # against four provider threads issuing eight conflicting writes per
 # generation -- and the write that loses is `complete_iteration`, i.e. an
@@ -34,6 +59,36 @@ MAX_RETRIES = 8
 RETRY_BASE_DELAY_MS = 25
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the second last formatted.
+#
+# Four provider threads stamp the same session within milliseconds of each
+# other, so the calendar arithmetic and strftime for the seconds part are
+# almost always for a second already formatted. Replaced as one tuple, never
+# mutated in place, so a thread can only ever read a matching pair.
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """The current UTC time, formatted as ``datetime.isoformat()`` formats it.
+
+    Microseconds are always present. ``isoformat()`` drops them when they are
+    zero, which made one value in a million a different length from the rest;
+    ``datetime.fromisoformat`` reads both forms, so records already in S3 and
+    records written here parse the same.
+    """
+    global _iso_second
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{ns // 1000:06d}+00:00"
+
+
+# Model statuses that count as that model having failed, for the session rollup.
+_FAILED_MODEL_STATUSES = frozenset({"error", "failed"})
+
+
 def _backoff_seconds(attempt: int) -> float:
     """Exponential backoff with jitter, in seconds, for attempt ``attempt``.
 
@@ -104,6 +159,16 @@ class SessionState(_SessionRequired, total=False):
     visibility: str
 
 
+def _new_model_column(enabled: bool) -> ModelColumn:
+    """A fresh, empty column: pending if the model is enabled, else disabled."""
+    return {
+        "enabled": enabled,
+        "status": "pending" if enabled else "disabled",
+        "iterationCount": 0,
+        "iterations": [],
+    }
+
+
 class ConcurrencyError(Exception):
     """Raised when optimistic locking retries are exhausted."""
 
@@ -174,17 +239,16 @@ class SessionManager:
             Session ID (UUID)
         """
         session_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).isoformat()
-
-        # Initialize model states for all 4 models
-        models: dict[str, ModelColumn] = {}
-        for model_name in MODELS.keys():
-            models[model_name] = {
-                "enabled": model_name in enabled_models,
-                "status": "pending" if model_name in enabled_models else "disabled",
-                "iterationCount": 0,
-                "iterations": [],
-            }
+        now = _utc_now_iso()
+
+        # Initialize model states for all 4 models. Membership is tested once
+        # per model against a set rather than twice against the caller's list;
+        # each column still gets its own ``iterations`` list, since columns are
+        # appended to independently.
+        enabled = set(enabled_models)
+        models: dict[str, ModelColumn] = {
+            model_name: _new_model_column(model_name in enabled) for model_name in MODELS
+        }
 
         status: SessionState = {
             "sessionId": session_id,
@@ -216,7 +280,7 @@ class SessionManager:
         try:
             key = f"sessions/{session_id}/status.json"
             response = self.s3.get_object(Bucket=self.bucket, Key=key)
-            state: SessionState = json.loads(response["Body"].read().decode("utf-8"))
+            state: SessionState = _loads(response["Body"].read())
             return state, response["ETag"]
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
@@ -263,6 +327,54 @@ class SessionManager:
         Raises:
             ValueError: If session/model not found or iteration limit reached
         """
+        return self._append_iteration(
+            session_id,
+            model,
+            prompt,
+            is_outpaint=is_outpaint,
+            outpaint_preset=outpaint_preset,
+            adapted_prompt=adapted_prompt,
+        )
+
+    def add_failed_iteration(self, session_id: str, model: str, prompt: str, error: str) -> int:
+        """
+        Record an iteration that failed before any work started, in one write.
+
+        Equivalent to ``add_iteration`` followed by ``fail_iteration``, which is
+        what the dispatch used to call for a model it could not resolve -- two
+        read/conditional-write cycles on ``status.json`` for a row that is never
+        observable in between. Here ``startedAt`` and ``completedAt`` are set in
+        the same mutation and the session is written once.
+
+        Only for the case where nothing happens between the two transitions.
+        A provider call in between is exactly what ``in_progress`` exists to
+        show, so the success path keeps its two writes.
+
+        Args:
+            session_id: Session identifier
+            model: Model name
+            prompt: Iteration prompt
+            error: Error message
+
+        Returns:
+            New iteration index
+
+        Raises:
+            ValueError: If session/model not found or iteration limit reached
+        """
+        return self._append_iteration(session_id, model, prompt, error=error)
+
+    def _append_iteration(
+        self,
+        session_id: str,
+        model: str,
+        prompt: str,
+        is_outpaint: bool = False,
+        outpaint_preset: str | None = None,
+        adapted_prompt: str | None = None,
+        error: str | None = None,
+    ) -> int:
+        """Append an iteration under the ETag lock; terminal when ``error`` is set."""
         for attempt in range(MAX_RETRIES):
             loaded = self._get_session_with_etag(session_id)
             if not loaded:
@@ -282,7 +394,7 @@ class SessionManager:
 
             original_version = session.get("version", 1)
             iteration_index = model_data["iterationCount"]
-            now = datetime.now(timezone.utc).isoformat()
+            now = _utc_now_iso()
 
             # Add iteration
             iteration: Iteration = {
@@ -296,10 +408,14 @@ class SessionManager:
                 iteration["adaptedPrompt"] = adapted_prompt
             if outpaint_preset:
                 iteration["outpaintPreset"] = outpaint_preset
+            if error is not None:
+                iteration["status"] = "error"
+                iteration["error"] = error
+                iteration["completedAt"] = now
 
             model_data["iterations"].append(iteration)
             model_data["iterationCount"] = iteration_index + 1
-            model_data["status"] = "in_progress"
+            model_data["status"] = self._compute_model_status(model_data)
 
             # Update session
             session["status"] = self._compute_session_status(session)
@@ -353,7 +469,13 @@ class SessionManager:
             if not iteration:
                 raise ValueError(f"Iteration {index} not found for model '{model}'")
 
-            now = datetime.now(timezone.utc).isoformat()
+            # Already recorded exactly this result -- a retried worker, or a
+            # redelivered async invocation. Rewriting it would change nothing
+            # but the timestamps and version, so do not pay a PUT for that.
+            if iteration["status"] == "completed" and iteration.get("imageKey") == image_key:
+                return
+
+            now = _utc_now_iso()
             iteration["status"] = "completed"
             iteration["imageKey"] = image_key
             iteration["completedAt"] = now
@@ -407,7 +529,11 @@ class SessionManager:
             if not iteration:
                 raise ValueError(f"Iteration {index} not found for model '{model}'")
 
-            now = datetime.now(timezone.utc).isoformat()
+            # Same for a failure already recorded with the same error.
+            if iteration["status"] == "error" and iteration.get("error") == error:
+                return
+
+            now = _utc_now_iso()
             iteration["status"] = "error"
             iteration["error"] = error
             iteration["completedAt"] = now
@@ -490,7 +616,7 @@ class SessionManager:
         self.s3.put_object(
             Bucket=self.bucket,
             Key=key,
-            Body=json.dumps(status),
+            Body=_dumps(status),
             ContentType="application/json",
         )
 
@@ -516,7 +642,7 @@ class SessionManager:
             self.s3.put_object(
                 Bucket=self.bucket,
                 Key=key,
-                Body=json.dumps(status),
+                Body=_dumps(status),
                 ContentType="application/json",
                 IfMatch=etag,
             )
@@ -543,13 +669,17 @@ class SessionManager:
         if not iterations:
             return "pending"
 
+        # One pass collects every status present; the answer only depends on
+        # which statuses occur, not on how often or in what order.
+        statuses = {it["status"] for it in iterations}
+
         # Check if any in progress
-        if any(it["status"] == "in_progress" for it in iterations):
+        if "in_progress" in statuses:
             return "in_progress"
 
         # All iterations complete
-        has_error = any(it["status"] == "error" for it in iterations)
-        has_completed = any(it["status"] == "completed" for it in iterations)
+        has_error = "error" in statuses
+        has_completed = "completed" in statuses
 
         if has_error and not has_completed:
             return "error"
@@ -566,20 +696,19 @@ class SessionManager:
         if not enabled_models:
             return "failed"
 
-        statuses = [m["status"] for m in enabled_models]
+        statuses = {m["status"] for m in enabled_models}
 
-        if any(s == "in_progress" for s in statuses):
+        if "in_progress" in statuses:
             return "in_progress"
 
-        if any(s == "pending" for s in statuses):
+        if "pending" in statuses:
             return "pending"
 
-        # All done (no pending or in_progress)
-        error_count = sum(1 for s in statuses if s in ["error", "failed"])
-
-        if error_count == len(enabled_models):
+        # All done (no pending or in_progress). Every enabled model failing is
+        # the same as every status present being a failure.
+        if statuses <= _FAILED_MODEL_STATUSES:
             return "failed"
-        elif error_count > 0:
+        elif statuses & _FAILED_MODEL_STATUSES:
             return "partial"
         else:
             return "completed"
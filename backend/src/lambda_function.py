@@ -36,6 +36,7 @@ from config import (
     get_model,
     get_model_config_dict,
     s3_bucket,
+    s3_pool_connections,
 )
 from gallery.repository import GalleryIndexRepository
 from jobs.manager import SessionManager
@@ -80,7 +81,14 @@ _RESERVED_LOG_METADATA_KEYS = frozenset(
 )
 
 # Initialize components at module level (Lambda container reuse)
-s3_client = boto3.client("s3")
+#
+# One S3 client for the container, shared by every manager below and by the
+# generation and gallery thread pools; config.s3_pool_connections sizes its
+# pool from those.
+s3_client = boto3.client(
+    "s3",
+    config=BotoConfig(max_pool_connections=s3_pool_connections, tcp_keepalive=True),
+)
 
 # Session manager (replaces job manager)
 session_manager = SessionManager(s3_client, s3_bucket)
@@ -118,6 +126,9 @@ prompt_enhancer = PromptEnhancer()
 # Separate pools prevent gallery metadata fetches from starving generation threads.
 _executor = ThreadPoolExecutor(max_workers=generate_thread_workers)
 _gallery_executor = ThreadPoolExecutor(max_workers=4)
+# Gallery-index writes, overlapped with the session write that follows each
+# upload. One per generation thread is all that can be outstanding.
+_index_executor = ThreadPoolExecutor(max_workers=generate_thread_workers)
 
 # Lambda client for the asynchronous /generate self-invoke. Lazily built so a
 # unit test without moto never constructs one at import.
@@ -693,6 +704,16 @@ def _source_ip_hash(event: LambdaEvent) -> str | None:
     return hashlib.sha256(str(ip).encode()).hexdigest()[:16]
 
 
+# Per-IP buckets known to be exhausted, mapped to the epoch second their
+# window ends. A refusal cannot change before then: the refused update does
+# not increment, and the condition that refused it only relaxes when the
+# window rolls. So until that second the answer is already known, and asking
+# DynamoDB again spends a write on the caller least entitled to one. Bounded
+# by insertion order; an evicted entry just costs one store call to relearn.
+_ip_refusals: dict[str, int] = {}
+_IP_REFUSALS_MAX = 4096
+
+
 def _public_ip_rate_limited(
     event: LambdaEvent,
     scope: str,
@@ -742,10 +763,15 @@ def _public_ip_rate_limited(
         return None
 
     now = int(time.time())
+    key = f"iplimit#{scope}#{ip_hash}"
+    refused_until = _ip_refusals.get(key)
+    if refused_until is not None:
+        if now < refused_until:
+            return _ip_rate_limit_response(scope, limit, refused_until - now, correlation_id)
+        del _ip_refusals[key]
+
     try:
-        ok, item = _user_repo.increment_ip_rate_bucket(
-            f"iplimit#{scope}#{ip_hash}", limit, window_seconds, now
-        )
+        ok, item = _user_repo.increment_ip_rate_bucket(key, limit, window_seconds, now)
     except Exception as e:
         store_breaker.record_store_result(False)
         StructuredLogger.error(
@@ -757,8 +783,17 @@ def _public_ip_rate_limited(
     if ok:
         return None
 
-    window_start = int(item.get("windowStart", now) or now)
-    retry_after = max(1, window_start + window_seconds - now)
+    window_end = int(item.get("windowStart", now) or now) + window_seconds
+    if window_end > now:
+        if len(_ip_refusals) >= _IP_REFUSALS_MAX:
+            del _ip_refusals[next(iter(_ip_refusals))]
+        _ip_refusals[key] = window_end
+    return _ip_rate_limit_response(scope, limit, max(1, window_end - now), correlation_id)
+
+
+def _ip_rate_limit_response(
+    scope: str, limit: int, retry_after: int, correlation_id: str | None
+) -> ApiResponse:
     StructuredLogger.warning(
         f"{scope} IP rate limit reached",
         correlation_id=correlation_id,
@@ -1016,18 +1051,26 @@ def _handle_successful_result(
         session_id=session_id,
         visibility=visibility,
     )
-    _index_public_gallery(image_key)
-
-    session_manager.complete_iteration(
-        session_id,
-        model_name,
-        iteration_index,
-        image_key,
-        duration,
-    )
+    # The gallery index is a DynamoDB write that nothing below depends on, so
+    # it runs while the session and context writes do instead of ahead of
+    # them. It is still awaited before returning: work left running when the
+    # handler returns is frozen with the container and may never land. The
+    # context entry stays after complete_iteration, so a failed completion
+    # never leaves context pointing at an iteration the session calls failed.
+    indexed = _index_executor.submit(_index_public_gallery, image_key)
+    try:
+        session_manager.complete_iteration(
+            session_id,
+            model_name,
+            iteration_index,
+            image_key,
+            duration,
+        )
 
-    entry = create_context_entry(iteration_index, context_prompt or prompt, image_key)
-    context_manager.add_entry(session_id, model_name, entry)
+        entry = create_context_entry(iteration_index, context_prompt or prompt, image_key)
+        context_manager.add_entry(session_id, model_name, entry)
+    finally:
+        indexed.result()
 
     return {
         "image_key": image_key,
@@ -1314,11 +1357,8 @@ def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
         )
         results[_missing] = {"status": "error", "error": "Model is not enabled"}
         try:
-            _handle_failed_result(
-                session_id,
-                _missing,
-                session_manager.add_iteration(session_id, _missing, prompt),
-                "Model is not enabled",
+            session_manager.add_failed_iteration(
+                session_id, _missing, prompt, "Model is not enabled"
             )
         except Exception as e:
             StructuredLogger.warning(
@@ -203,7 +203,12 @@ class ContextManager:
             return True
         except ClientError as e:
             code = e.response["Error"]["Code"]
-            if code in ("PreconditionFailed", "412"):
+            # As in SessionManager._save_status_if_unmodified: a 409
+            # ConditionalRequestConflict is S3 reporting a concurrent
+            # conditional write to the same key. It is the same lost race as a
+            # 412 and wants the same re-read and merge, not a ClientError
+            # escaping add_entry after the image itself already landed.
+            if code in ("PreconditionFailed", "412", "ConditionalRequestConflict", "409"):
                 return False
             raise
 
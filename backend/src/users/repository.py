@@ -11,6 +11,7 @@ import time
 from typing import Any
 
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 
 _GLOBAL_GUEST_KEY = "guest#__global__"
@@ -28,6 +29,23 @@ _WEBHOOK_LEASE_SECONDS = 900
 # the window it is counting or a live counter could vanish mid-window.
 _IP_BUCKET_TTL_GRACE_SECONDS = 3 * 86400
 
+_DESERIALIZER = TypeDeserializer()
+
+
+def _item_from_failed_condition(error: ClientError) -> dict | None:
+    """The item a rejected conditional write saw, if the error carries it.
+
+    Requires ``ReturnValuesOnConditionCheckFailure="ALL_OLD"`` on the write.
+    The error arrives from the low-level client, so the attributes are in wire
+    format (``{"N": "3"}``) even though the call went through the resource
+    ``Table``; they are deserialized here into the same shape ``get_item``
+    returns. None when the item did not exist or the backend omitted it.
+    """
+    raw = error.response.get("Item")
+    if not raw:
+        return None
+    return {k: _DESERIALIZER.deserialize(v) for k, v in raw.items()}
+
 
 class UserRepository:
     """CRUD + atomic quota updates for the users table."""
@@ -684,12 +702,19 @@ class UserRepository:
                         ":stale": now - window_seconds,
                     },
                     ReturnValues="ALL_NEW",
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
                 )
                 return True, resp.get("Attributes", {})
             except ClientError as e:
                 if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
                     raise
-                item = self.get_user(key) or {}
+                # The rejected write hands back the item it was evaluated
+                # against, so telling "at the limit" from "window rolled" no
+                # longer costs a GetItem -- and a caller being refused, which
+                # is the caller hammering the endpoint, is exactly the one
+                # that should not get a second operation per request. The
+                # read stays as the fallback for a backend that omits it.
+                item = _item_from_failed_condition(e) or self.get_user(key) or {}
                 window_start = int(item.get("windowStart", 0) or 0)
                 if window_start and window_start > now - window_seconds:
                     # Inside the window: genuinely at the limit.
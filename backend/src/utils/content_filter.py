@@ -20,6 +20,7 @@ more than a keyword filter is how it came to reject blood oranges.
 
 import re
 import unicodedata
+from collections.abc import Iterable
 
 # Leetspeak substitution map: 0->o, 1->i, 3->e, 4->a, 5->s, 7->t, @->a,
 # $->s, 8->b.
@@ -35,6 +36,9 @@ _LEET_MAP = str.maketrans("013457@$8", "oieastasb")
 # Pattern to detect deliberate character-separated evasion (e.g. "n.u.d.e", "n u d e")
 _EVASION_PATTERN = re.compile(r"(?:\w[\s\-_\.]+){2,}\w")
 
+# The separators _normalize_words collapses and the evasion pass strips.
+_SEPARATORS = re.compile(r"[\s\-_\.]+")
+
 
 def _normalize_base(text: str) -> str:
     """
@@ -45,17 +49,27 @@ def _normalize_base(text: str) -> str:
     3. Leetspeak substitution (0→o, 1→i, 3→e, etc.)
     """
     text = text.lower()
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    # Step 2 is the identity on ASCII -- NFKD leaves it alone and it has no
+    # combining marks -- and most prompts are ASCII, so skip the decomposition
+    # and the per-character Python loop for them. Non-ASCII keeps the full
+    # NFKD pass rather than a hand-written fold table: NFKD also folds
+    # fullwidth letters, ligatures and other compatibility forms, which a table
+    # of accented vowels would quietly let through.
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
     text = text.translate(_LEET_MAP)
     return text
 
 
 def _normalize_words(text: str) -> str:
     """Normalize preserving word boundaries (for word-boundary matching)."""
-    text = _normalize_base(text)
-    text = re.sub(r"[\s\-_\.]+", " ", text).strip()
-    return text
+    return _words_from_base(_normalize_base(text))
+
+
+def _words_from_base(base: str) -> str:
+    """The word-boundary form of text that has already been base-normalized."""
+    return _SEPARATORS.sub(" ", base).strip()
 
 
 # Terms whose ordinary uses are all disallowed here. No allowlist: these are
@@ -123,11 +137,23 @@ BENIGN_COLLOCATIONS = (
 )
 
 
-def _word_pattern(phrase: str) -> re.Pattern[str]:
-    return re.compile(r"\b" + re.escape(_normalize_words(phrase)) + r"\b")
+def _alternation(phrases: Iterable[str]) -> str:
+    return "|".join(re.escape(_normalize_words(phrase)) for phrase in phrases)
+
 
+def _word_pattern(phrases: Iterable[str]) -> re.Pattern[str]:
+    """One word-boundary pattern matching any of ``phrases``.
 
-def _collocation_pattern(phrase: str) -> re.Pattern[str]:
+    A single alternation rather than a pattern per phrase, so a prompt is
+    scanned once per tier instead of once per keyword. ``search`` finds a
+    match exactly when one of the per-phrase patterns would have: where one
+    alternative matches but its closing ``\b`` fails, the engine backtracks
+    into the others.
+    """
+    return re.compile(r"\b(?:" + _alternation(phrases) + r")\b")
+
+
+def _collocation_pattern(phrases: Iterable[str]) -> re.Pattern[str]:
     """Allowlist pattern, tolerant of a plural on the final word.
 
     ``_word_pattern``'s trailing ``\\b`` means "blood orange" does not match
@@ -153,7 +179,32 @@ def _collocation_pattern(phrase: str) -> re.Pattern[str]:
     from the residue. An allowlist should match the phrases it lists, not
     approximations of them.
     """
-    return re.compile(r"\b" + re.escape(_normalize_words(phrase)) + r"s?\b")
+    return re.compile(r"\b(?:" + _alternation(phrases) + r")s?\b")
+
+
+# Compiled once at import. The keyword lists are constants, so every
+# ContentFilter would otherwise rebuild identical alternations -- and the
+# tests, the e2e suite and any second instance in a warm container all did.
+_UNAMBIGUOUS_PATTERN = _word_pattern(UNAMBIGUOUS_KEYWORDS)
+_CONTEXT_PATTERN = _word_pattern(CONTEXT_DEPENDENT_KEYWORDS)
+_BENIGN_PATTERN = _collocation_pattern(BENIGN_COLLOCATIONS)
+# Pre-normalized keywords for the evasion check. Both tiers participate:
+# spelling a word out letter by letter is deliberate, so the benign reading no
+# longer applies to it. Unanchored: a collapsed run has no word boundaries left
+# to anchor to.
+_COLLAPSED_KEYWORDS = re.compile(
+    "|".join(
+        re.escape(re.sub(r"\s+", "", _normalize_words(kw)))
+        for kw in (*UNAMBIGUOUS_KEYWORDS, *CONTEXT_DEPENDENT_KEYWORDS)
+    )
+)
+# The fewest characters any keyword can match in, measured on the collapsed
+# form -- the shortest of the three. Every pattern above matches literal
+# keyword text, so a normalized prompt shorter than this cannot match any.
+_MIN_KEYWORD_LEN = min(
+    len(re.sub(r"\s+", "", _normalize_words(kw)))
+    for kw in (*UNAMBIGUOUS_KEYWORDS, *CONTEXT_DEPENDENT_KEYWORDS)
+)
 
 
 class ContentFilter:
@@ -169,17 +220,11 @@ class ContentFilter:
     """
 
     def __init__(self) -> None:
-        """Initialize Content Filter with blocked keywords."""
-        self._unambiguous_patterns = [_word_pattern(kw) for kw in UNAMBIGUOUS_KEYWORDS]
-        self._context_patterns = [_word_pattern(kw) for kw in CONTEXT_DEPENDENT_KEYWORDS]
-        self._benign_patterns = [_collocation_pattern(p) for p in BENIGN_COLLOCATIONS]
-        # Pre-normalize keywords for evasion check. Both tiers participate:
-        # spelling a word out letter by letter is deliberate, so the benign
-        # reading no longer applies to it.
-        self._collapsed_keywords = set(
-            re.sub(r"\s+", "", _normalize_words(kw))
-            for kw in (*UNAMBIGUOUS_KEYWORDS, *CONTEXT_DEPENDENT_KEYWORDS)
-        )
+        """Bind the module's compiled patterns; there is nothing per instance."""
+        self._unambiguous_pattern = _UNAMBIGUOUS_PATTERN
+        self._context_pattern = _CONTEXT_PATTERN
+        self._benign_pattern = _BENIGN_PATTERN
+        self._collapsed_keywords = _COLLAPSED_KEYWORDS
 
     def check_prompt(self, prompt: str) -> bool:
         """
@@ -194,30 +239,32 @@ class ContentFilter:
         if not prompt:
             return False
 
+        # Normalized once; both passes start from the same base form.
+        base = _normalize_base(prompt)
+        # Measured after normalization, not before: NFKD can expand a single
+        # compatibility character into several letters.
+        if len(base) < _MIN_KEYWORD_LEN:
+            return False
+
         # Pass 1a: unambiguous terms, word-boundary matched.
-        normalized_words = _normalize_words(prompt)
-        for pattern in self._unambiguous_patterns:
-            if pattern.search(normalized_words):
-                return True
+        normalized_words = _words_from_base(base)
+        if self._unambiguous_pattern.search(normalized_words):
+            return True
 
         # Pass 1b: context-dependent terms, with the benign collocations
         # removed first. Removing rather than short-circuiting on a match is
         # what keeps the allowlist from becoming an evasion vector: "a blood
         # moon and blood everywhere" still leaves a bare "blood" behind, and
-        # is still blocked.
-        residue = normalized_words
-        for pattern in self._benign_patterns:
-            residue = pattern.sub(" ", residue)
-        for pattern in self._context_patterns:
-            if pattern.search(residue):
-                return True
+        # is still blocked. Every collocation contains its keyword, so where
+        # two overlap, removing either one removes that keyword.
+        residue = self._benign_pattern.sub(" ", normalized_words)
+        if self._context_pattern.search(residue):
+            return True
 
         # Pass 2: evasion detection — find char-separated sequences, collapse them
-        base = _normalize_base(prompt)
         for match in _EVASION_PATTERN.finditer(base):
-            collapsed = re.sub(r"[\s\-_\.]+", "", match.group())
-            for keyword in self._collapsed_keywords:
-                if keyword in collapsed:
-                    return True
+            collapsed = _SEPARATORS.sub("", match.group())
+            if self._collapsed_keywords.search(collapsed):
+                return True
 
         return False
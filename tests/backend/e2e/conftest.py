@@ -13,13 +13,18 @@ still exercises the whole path -- it is the transport that is stubbed out, not
 the work.
 """
 
+import functools
 import os
+import socket
 import uuid
-from unittest.mock import patch
+from urllib.parse import urlsplit
 
-import boto3
 import pytest
-import requests
+
+# boto3 and requests are imported where they are used, not here. Both skip
+# markers are evaluated at collection, and when MiniStack is down -- the usual
+# case outside CI -- every test skips and neither library is ever needed; the
+# import alone was the slowest thing this file did on that path.
 
 # Set before anything imports config: config reads the variable once, at import,
 # and nothing above this line pulls it in.
@@ -30,41 +35,133 @@ os.environ["GENERATE_ASYNC"] = "false"
 MINISTACK_ENDPOINT = os.environ.get("MINISTACK_ENDPOINT", "http://localhost:4566")
 
 
-def _ministack_available() -> bool:
+@functools.lru_cache(maxsize=1)
+def _ministack_health() -> dict | None:
+    """MiniStack's health document, or None when it is not reachable.
+
+    Fetched once per process. Both skip checks and the DynamoDB fixture ask
+    for it on every test, so each question used to be its own HTTP round
+    trip. A plain TCP connect goes first, with a short
+    timeout: when nothing is listening -- the usual case outside CI -- that
+    answers in well under the HTTP timeout instead of waiting it out on an
+    unroutable endpoint.
+    """
+    endpoint = urlsplit(MINISTACK_ENDPOINT)
     try:
+        socket.create_connection((endpoint.hostname, endpoint.port or 80), timeout=0.25).close()
+        import requests
+
         resp = requests.get(f"{MINISTACK_ENDPOINT}/_ministack/health", timeout=2)
-        return resp.status_code == 200
     except Exception:
-        return False
+        return None
+    if resp.status_code != 200:
+        return None
+    try:
+        return resp.json() or {}
+    except ValueError:
+        return {}
+
+
+def _ministack_available() -> bool:
+    return _ministack_health() is not None
 
 
-skip_no_ministack = pytest.mark.skipif(
-    not _ministack_available(),
-    reason="MiniStack not running",
-)
+# Plain marks, resolved in pytest_runtest_setup below rather than skipif
+# conditions evaluated at import. A skipif condition is computed when the test
+# module is imported, so `pytest tests/backend -m "not e2e"` probed MiniStack
+# for tests it was about to deselect. Setup only runs for tests that were
+# selected, so a deselected suite never probes at all.
+skip_no_ministack = pytest.mark.needs_ministack
 
 # ── Fixtures ───────────────────────────────────────────────────────────
 
 
-@pytest.fixture
-def ministack_s3():
-    """Create a real S3 client pointing at MiniStack with a fresh bucket."""
-    s3 = boto3.client(
+@pytest.fixture(scope="session")
+def ministack_s3_client():
+    """One S3 client for the whole run; building one per test was pure overhead.
+
+    A short connect timeout, in place of botocore's 60 seconds: a local
+    emulator that has not accepted the connection in two seconds is not going
+    to, and a request that never connected was never sent, so retrying it is
+    safe for every call. The read timeout and retry policy stay botocore's
+    defaults on purpose. This is what the handler's own S3 calls go through
+    -- e2e_handler installs this client as lambda_function.s3_client -- and
+    those include the IfMatch conditional PUTs. A PUT that landed but
+    answered slowly, abandoned and retried, comes back 412 against its own
+    write; SessionManager then re-reads and re-appends, and add_iteration
+    records the iteration twice. The tests' own reads, which can be bounded,
+    go through ministack_s3_read_client.
+
+    Pooled like the production client it replaces: the generation and gallery
+    thread pools share it, and past botocore's default of 10 connections each
+    extra concurrent call opens a connection only to discard it afterwards.
+    """
+    import boto3
+    from botocore.config import Config
+
+    from config import s3_pool_connections
+
+    return boto3.client(
+        "s3",
+        endpoint_url=MINISTACK_ENDPOINT,
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        config=Config(
+            connect_timeout=2,
+            max_pool_connections=s3_pool_connections,
+            tcp_keepalive=True,
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def ministack_s3_read_client():
+    """A second client, for the tests' own reads of what the handler wrote.
+
+    Bounded where ministack_s3_client cannot be: a 5-second read timeout and
+    standard retries. A local emulator answers in milliseconds, so a GET that
+    has stalled for seconds is not going to finish, and abandoning and
+    retrying it turns an occasional minute-long hang into a few seconds. Safe
+    here because nothing on this client writes -- e2e_handler hands the tests
+    a SessionManager and ContextManager built on it, and the tests only read
+    through those.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
         "s3",
         endpoint_url=MINISTACK_ENDPOINT,
         region_name="us-east-1",
         aws_access_key_id="test",
         aws_secret_access_key="test",
+        config=Config(
+            connect_timeout=2,
+            read_timeout=5,
+            retries={"max_attempts": 4, "mode": "standard"},
+            tcp_keepalive=True,
+        ),
     )
+
+
+@pytest.fixture
+def ministack_s3(ministack_s3_client):
+    """A fresh MiniStack bucket per test, on the shared session client."""
+    s3 = ministack_s3_client
     bucket = f"e2e-test-{uuid.uuid4().hex[:8]}"
     s3.create_bucket(Bucket=bucket)
     yield s3, bucket
 
-    # Cleanup: delete all objects then the bucket
+    # Cleanup: delete all objects then the bucket. Paged, because a single
+    # list returns at most 1,000 keys and anything past that left the bucket
+    # undeletable; and batched, one DeleteObjects per page rather than one
+    # request per key.
     try:
-        resp = s3.list_objects_v2(Bucket=bucket)
-        for obj in resp.get("Contents", []):
-            s3.delete_object(Bucket=bucket, Key=obj["Key"])
+        for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+            keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if keys:
+                s3.delete_objects(Bucket=bucket, Delete={"Objects": keys, "Quiet": True})
         s3.delete_bucket(Bucket=bucket)
     except Exception:
         pass
@@ -79,17 +176,25 @@ def _ministack_has_dynamodb() -> bool:
     was removed, so without DynamoDB that one workflow cannot be exercised
     here and says so, rather than appearing to pass.
     """
-    try:
-        resp = requests.get(f"{MINISTACK_ENDPOINT}/_ministack/health", timeout=2)
-        return "dynamodb" in (resp.json().get("services") or {})
-    except Exception:
-        return False
+    health = _ministack_health()
+    return health is not None and "dynamodb" in (health.get("services") or {})
+
+
+requires_dynamodb = pytest.mark.needs_ministack_dynamodb
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "needs_ministack: skipped unless MiniStack is reachable")
+    config.addinivalue_line(
+        "markers", "needs_ministack_dynamodb: skipped unless MiniStack serves DynamoDB"
+    )
 
 
-requires_dynamodb = pytest.mark.skipif(
-    not _ministack_has_dynamodb(),
-    reason="MiniStack light serves S3 only; the gallery index needs DynamoDB",
-)
+def pytest_runtest_setup(item):
+    if item.get_closest_marker("needs_ministack") and not _ministack_available():
+        pytest.skip("MiniStack not running")
+    if item.get_closest_marker("needs_ministack_dynamodb") and not _ministack_has_dynamodb():
+        pytest.skip("MiniStack light serves S3 only; the gallery index needs DynamoDB")
 
 
 @pytest.fixture
@@ -103,6 +208,8 @@ def ministack_dynamodb():
         yield None, None
         return
 
+    import boto3
+
     dynamodb = boto3.resource(
         "dynamodb",
         endpoint_url=MINISTACK_ENDPOINT,
@@ -139,42 +246,77 @@ def ministack_dynamodb():
         pass
 
 
+# One result per operation, built once and returned by reference. The handler
+# path only reads a provider result -- status, then image -- so every call can
+# share one dict.
+_FAKE_GENERATE_RESULT = {"status": "success", "image": "ZmFrZWltYWdl"}  # base64("fakeimage")
+_FAKE_ITERATE_RESULT = {"status": "success", "image": "aXRlcmF0ZWQ="}  # base64("iterated")
+_FAKE_OUTPAINT_RESULT = {"status": "success", "image": "b3V0cGFpbnRlZA=="}  # base64("outpainted")
+
+
 def _fake_generate(config, prompt, params):
     """Fake image generation handler returning a deterministic base64 stub."""
-    return {"status": "success", "image": "ZmFrZWltYWdl"}  # base64("fakeimage")
+    return _FAKE_GENERATE_RESULT
 
 
 def _fake_iterate(config, source_image, prompt, context):
     """Fake iteration handler."""
-    return {"status": "success", "image": "aXRlcmF0ZWQ="}  # base64("iterated")
+    return _FAKE_ITERATE_RESULT
 
 
 def _fake_outpaint(config, source_image, preset, prompt):
     """Fake outpaint handler."""
-    return {"status": "success", "image": "b3V0cGFpbnRlZA=="}  # base64("outpainted")
+    return _FAKE_OUTPAINT_RESULT
+
+
+@pytest.fixture(scope="session")
+def content_filter():
+    """Shared across the run: it holds only patterns compiled from constants."""
+    from utils.content_filter import ContentFilter
+
+    return ContentFilter()
+
+
+def _build_components(s3, bucket):
+    """The S3-backed components, bound to this test's bucket.
+
+    Rebuilt per test because the bucket is per test, and that binding is all
+    their constructors do -- there is no other state to reset. Imported here
+    rather than at the top so that nothing pulls in config before the
+    GENERATE_ASYNC assignment above has run.
+    """
+    from jobs.manager import SessionManager
+    from models.context import ContextManager
+    from utils.storage import ImageStorage
+
+    return (
+        SessionManager(s3, bucket),
+        ContextManager(s3, bucket),
+        ImageStorage(s3, bucket, "test.cloudfront.net"),
+    )
 
 
 @pytest.fixture
-def e2e_handler(ministack_s3, ministack_dynamodb):
+def e2e_handler(
+    ministack_s3, ministack_s3_read_client, ministack_dynamodb, content_filter, monkeypatch
+):
     """
     Construct real S3-backed components against MiniStack, patch them into
     lambda_function module singletons, and yield the lambda_handler.
 
-    Only model API handler functions are stubbed with fakes.
+    Only model API handler functions are stubbed with fakes. The
+    SessionManager and ContextManager yielded alongside it are for the tests'
+    assertions: same bucket, but on ministack_s3_read_client, so their reads
+    are bounded while the handler's conditional writes keep botocore's
+    defaults.
     """
     s3, bucket = ministack_s3
     dynamodb, table_name = ministack_dynamodb
 
     from gallery.repository import GalleryIndexRepository
-    from jobs.manager import SessionManager
-    from models.context import ContextManager
-    from utils.content_filter import ContentFilter
-    from utils.storage import ImageStorage
 
-    sm = SessionManager(s3, bucket)
-    cm = ContextManager(s3, bucket)
-    storage = ImageStorage(s3, bucket, "test.cloudfront.net")
-    cf = ContentFilter()
+    sm, cm, storage = _build_components(s3, bucket)
+    cf = content_filter
 
     patches = {
         # Redundant with the GENERATE_ASYNC env var above, deliberately: the
@@ -199,15 +341,14 @@ def e2e_handler(ministack_s3, ministack_dynamodb):
         )
         patches["lambda_function._gallery_backfilled"] = False
 
-    patchers = []
+    # Plain attribute swaps, undone by monkeypatch at teardown -- including
+    # when a later one fails, which a hand-rolled start/stop loop leaked.
+    # Nothing here needs a Mock, so nothing pays for mock.patch.
     for target, value in patches.items():
-        p = patch(target, value)
-        p.start()
-        patchers.append(p)
+        monkeypatch.setattr(target, value)
 
     from lambda_function import lambda_handler
 
-    yield lambda_handler, sm, cm, storage, None
+    read_sm, read_cm, _ = _build_components(ministack_s3_read_client, bucket)
 
-    for p in patchers:
-        p.stop()
+    yield lambda_handler, read_sm, read_cm, storage, None
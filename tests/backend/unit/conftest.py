@@ -2,7 +2,9 @@
 Pytest configuration and fixtures for backend unit tests
 """
 
+import importlib
 import os
+import uuid
 
 # AUTH_ENABLED has no default in config.py -- there is no safe value to guess,
 # so it must be chosen explicitly. Set it here before anything imports config,
@@ -35,6 +37,31 @@ def _reset_singletons():
     _reset_handler_singletons()
 
 
+@pytest.fixture(autouse=True)
+def _reload_config_if_changed():
+    """Re-read config from the real environment after any test that reloaded it.
+
+    Tests that reload config under a monkeypatched environment leave the module
+    holding what they read: monkeypatch puts os.environ back, but not the values
+    config computed from it, and a reload in the test's own cleanup runs before
+    monkeypatch's -- so it re-reads the patched environment. Every later test in
+    the same process then inherits it; a leftover ``age_gate_enabled = True``
+    turns /generate into a 403. Serially some later reload usually hides this,
+    under xdist it depends on which files share a worker.
+
+    Requests nothing, so it is set up before any test's monkeypatch and torn
+    down after it. The snapshot is by identity: a reload rebinds module
+    attributes, and only then is the (comparatively slow) reload repeated.
+    """
+    import config
+
+    before = dict(vars(config))
+    yield
+    after = vars(config)
+    if any(after.get(name) is not value for name, value in before.items()):
+        importlib.reload(config)
+
+
 @pytest.fixture
 def mock_s3():
     """Mock S3 client for testing storage operations"""
@@ -49,6 +76,34 @@ def mock_s3():
         yield s3, bucket_name
 
 
+@pytest.fixture(scope='module')
+def _module_moto_s3():
+    """One moto backend and S3 client per test module, for moto_s3_bucket."""
+    with mock_aws():
+        yield boto3.client('s3', region_name='us-east-1')
+
+
+@pytest.fixture
+def moto_s3_bucket(_module_moto_s3):
+    """Same (client, bucket) shape as mock_s3, for modules that use only S3.
+
+    mock_s3 starts and resets a whole moto backend per test. Here the backend
+    lives for the module and each test gets a uuid-named bucket, emptied and
+    deleted afterwards, so isolation comes from the name rather than a reset.
+    Not for modules that also drive DynamoDB or other services through
+    mock_aws: those rely on the per-test reset.
+    """
+    s3 = _module_moto_s3
+    bucket_name = f'test-pixel-prompt-{uuid.uuid4().hex[:12]}'
+    s3.create_bucket(Bucket=bucket_name)
+    yield s3, bucket_name
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket_name):
+        keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+        if keys:
+            s3.delete_objects(Bucket=bucket_name, Delete={'Objects': keys})
+    s3.delete_bucket(Bucket=bucket_name)
+
+
 @pytest.fixture
 def mock_model_config():
     """Sample model configuration for testing (5-field format)"""
@@ -60,6 +115,22 @@ def mock_model_config():
     }
 
 
+@pytest.fixture
+def gemini_config():
+    """The Gemini counterpart of ``mock_model_config``.
+
+    Function-scoped like it: a fresh dict per test costs nothing measurable,
+    and no test can leak a mutation into the next. test_gemini_handler.py
+    overrides it with the current image model's id.
+    """
+    return {
+        'index': 1,
+        'provider': 'google_gemini',
+        'id': 'gemini-2.0-flash-exp',
+        'api_key': 'test-gemini-key'
+    }
+
+
 @pytest.fixture
 def sample_prompt():
     """Sample prompt for testing"""
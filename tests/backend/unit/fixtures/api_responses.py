@@ -3,6 +3,7 @@ Mock API responses for testing model handlers
 """
 
 import base64
+import json
 
 # Sample base64-encoded image data (1x1 PNG)
 SAMPLE_IMAGE_BASE64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
@@ -52,6 +53,9 @@ BEDROCK_NOVA_RESPONSE = {
     ]
 }
 
+# The Nova response as invoke_model's body stream carries it, encoded once.
+BEDROCK_NOVA_RESPONSE_BYTES = json.dumps(BEDROCK_NOVA_RESPONSE).encode("utf-8")
+
 # AWS Bedrock Stable Diffusion Response
 BEDROCK_SD_RESPONSE = {
     "artifacts": [
@@ -239,11 +239,9 @@ def test_the_flag_defaults_on(monkeypatch):
 
     monkeypatch.delenv("AGE_GATE_ENABLED", raising=False)
     monkeypatch.setenv("AUTH_ENABLED", "false")
-    cfg = importlib.reload(config)
-    try:
-        assert cfg.age_gate_enabled is True
-    finally:
-        importlib.reload(config)
+    # Reloaded back from the real environment by the unit conftest, after
+    # monkeypatch has restored it.
+    assert importlib.reload(config).age_gate_enabled is True
 
 
 def test_generate_is_refused_before_any_provider_is_called():
@@ -2,150 +2,164 @@
 Unit tests for the v2 configuration module.
 """
 
+import importlib
 import os
-from unittest.mock import patch
 
 import pytest
 
 
+def _reload_config():
+    import config
+
+    return importlib.reload(config)
+
+
+def _use_env(monkeypatch, env):
+    """Make ``env`` the whole environment for the rest of the test.
+
+    Undone by monkeypatch at teardown, which runs before ``_restore_config``
+    reloads -- so the reload reads the real environment again.
+    """
+    for name in list(os.environ):
+        if name not in env:
+            monkeypatch.delenv(name)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+
+@pytest.fixture
+def _restore_config():
+    """Re-read config from the real environment once each test is done.
+
+    For the tests that reload config under a cleared environment. monkeypatch puts
+    os.environ back, but the module keeps whatever it read -- S3_BUCKET unset,
+    every model disabled -- and every later test in the process that reads
+    ``config.<name>`` at call time would inherit it.
+    """
+    yield
+    _reload_config()
+
+
 class TestModelConfig:
-    """Tests for ModelConfig dataclass and model loading."""
+    """Tests for ModelConfig dataclass and model loading.
 
-    def test_get_enabled_models_returns_enabled_only(self):
+    Built from _load_models_from_env with a plain dict rather than a module
+    reload: the rules under test are a function of the environment, and a
+    reload re-runs every other import-time check in config to reach them.
+    Tests that go through the public accessors swap the result in as MODELS.
+    """
+
+    @staticmethod
+    def _use_models(monkeypatch, env):
+        import config
+
+        monkeypatch.setattr(config, 'MODELS', config._load_models_from_env(env))
+        return config
+
+    def test_get_enabled_models_returns_enabled_only(self, monkeypatch):
         """Only enabled models should be returned."""
         env = {
-            # No default in config.py; clear=True would otherwise wipe it.
-            'AUTH_ENABLED': 'false',
             'GEMINI_ENABLED': 'true',
             'GEMINI_API_KEY': 'test-key-2',
             'OPENAI_ENABLED': 'false',
         }
-        with patch.dict(os.environ, env, clear=True):
-            # Re-import to pick up env
-            import importlib
+        config = self._use_models(monkeypatch, env)
 
-            import config
-            importlib.reload(config)
+        enabled = config.get_enabled_models()
+        names = [m.name for m in enabled]
 
-            enabled = config.get_enabled_models()
-            names = [m.name for m in enabled]
+        assert 'gemini' in names
+        assert 'openai' not in names
 
-            assert 'gemini' in names
-            assert 'openai' not in names
-
-    def test_get_model_returns_config_when_enabled(self):
+    def test_get_model_returns_config_when_enabled(self, monkeypatch):
         """get_model() should return config for enabled model."""
         env = {
-            # No default in config.py; clear=True would otherwise wipe it.
-            'AUTH_ENABLED': 'false',
             'GEMINI_ENABLED': 'true',
             'GEMINI_API_KEY': 'test-gemini-key',
             'GEMINI_MODEL_ID': 'gemini-test',
         }
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
+        config = self._use_models(monkeypatch, env)
 
-            import config
-            importlib.reload(config)
+        model = config.get_model('gemini')
+        assert model.name == 'gemini'
+        assert model.api_key == 'test-gemini-key'
+        assert model.model_id == 'gemini-test'
 
-            model = config.get_model('gemini')
-            assert model.name == 'gemini'
-            assert model.api_key == 'test-gemini-key'
-            assert model.model_id == 'gemini-test'
-
-    def test_get_model_raises_for_disabled(self):
+    def test_get_model_raises_for_disabled(self, monkeypatch):
         """get_model() should raise ValueError for disabled model."""
-        env = {
-            # No default in config.py; clear=True would otherwise wipe it.
-            'AUTH_ENABLED': 'false',
-            'OPENAI_ENABLED': 'false',
-        }
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
+        config = self._use_models(monkeypatch, {'OPENAI_ENABLED': 'false'})
 
-            import config
-            importlib.reload(config)
+        with pytest.raises(ValueError) as excinfo:
+            config.get_model('openai')
+        assert 'disabled' in str(excinfo.value).lower()
 
-            with pytest.raises(ValueError) as excinfo:
-                config.get_model('openai')
-            assert 'disabled' in str(excinfo.value).lower()
-
-    def test_get_model_raises_for_unknown(self):
+    def test_get_model_raises_for_unknown(self, monkeypatch):
         """get_model() should raise ValueError for unknown model name."""
-        # AUTH_ENABLED has no default; clear=True would wipe it.
-        env = {'AUTH_ENABLED': 'false'}
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
-
-            import config
-            importlib.reload(config)
+        config = self._use_models(monkeypatch, {})
 
-            with pytest.raises(ValueError) as excinfo:
-                config.get_model('unknown_model')
-            assert 'unknown model' in str(excinfo.value).lower()
+        with pytest.raises(ValueError) as excinfo:
+            config.get_model('unknown_model')
+        assert 'unknown model' in str(excinfo.value).lower()
 
-    def test_get_model_config_dict(self):
+    def test_get_model_config_dict(self, monkeypatch):
         """get_model_config_dict() should return handler-compatible dict."""
         env = {
-            # No default in config.py; clear=True would otherwise wipe it.
-            'AUTH_ENABLED': 'false',
             'GEMINI_ENABLED': 'true',
             'GEMINI_API_KEY': 'test-gemini-key',
             'GEMINI_MODEL_ID': 'gemini-2.0-flash',
         }
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
-
-            import config
-            importlib.reload(config)
+        config = self._use_models(monkeypatch, env)
 
-            model = config.get_model('gemini')
-            config_dict = config.get_model_config_dict(model)
+        model = config.get_model('gemini')
+        config_dict = config.get_model_config_dict(model)
 
-            assert config_dict['id'] == 'gemini-2.0-flash'
-            assert config_dict['api_key'] == 'test-gemini-key'
-            assert config_dict['provider'] == 'google_gemini'
+        assert config_dict['id'] == 'gemini-2.0-flash'
+        assert config_dict['api_key'] == 'test-gemini-key'
+        assert config_dict['provider'] == 'google_gemini'
 
     def test_default_values_when_env_missing(self):
         """Models requiring credentials are disabled when env vars missing; Nova (IAM auth) stays enabled."""
-        # AUTH_ENABLED has no default; clear=True would wipe it.
-        env = {'AUTH_ENABLED': 'false'}
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
+        import config
 
-            import config
-            importlib.reload(config)
+        models = config._load_models_from_env({})
 
-            # Nova uses IAM role and stays enabled; others require credentials and are disabled
-            enabled = config.get_enabled_models()
-            enabled_names = {m.name for m in enabled}
-            assert enabled_names == {"nova"}
+        # Nova uses IAM role and stays enabled; others require credentials and are disabled
+        enabled_names = {name for name, m in models.items() if m.enabled}
+        assert enabled_names == {"nova"}
 
     def test_all_models_enabled_with_credentials(self):
         """All 4 models enabled when credentials are present."""
+        import config
+
         env = {
-            # No default in config.py; clear=True would otherwise wipe it.
-            'AUTH_ENABLED': 'false',
             "GEMINI_API_KEY": "test-gemini-key",
             "OPENAI_API_KEY": "test-openai-key",
             "FIREFLY_CLIENT_ID": "test-firefly-id",
             "FIREFLY_CLIENT_SECRET": "test-firefly-secret",
         }
-        with patch.dict(os.environ, env, clear=True):
-            import importlib
+        models = config._load_models_from_env(env)
 
-            import config
-            importlib.reload(config)
+        assert all(m.enabled for m in models.values())
+        assert len(models) == 4
+
+    @pytest.mark.usefixtures('_restore_config')
+    def test_module_models_are_built_from_the_process_environment(self, monkeypatch):
+        """The one reload left: MODELS itself must come from os.environ."""
+        env = {
+            # No default in config.py; _use_env would otherwise wipe it.
+            'AUTH_ENABLED': 'false',
+            'GEMINI_API_KEY': 'test-gemini-key',
+            'GEMINI_MODEL_ID': 'gemini-from-env',
+        }
+        _use_env(monkeypatch, env)
+        config = _reload_config()
 
-            enabled = config.get_enabled_models()
-            assert len(enabled) == 4
+        assert config.MODELS == config._load_models_from_env(env)
+        assert config.get_model('gemini').model_id == 'gemini-from-env'
 
     def test_iteration_limits_defined(self):
         """MAX_ITERATIONS and ITERATION_WARNING_THRESHOLD should be defined."""
-        import importlib
-
         import config
-        importlib.reload(config)
 
         assert hasattr(config, 'MAX_ITERATIONS')
         assert hasattr(config, 'ITERATION_WARNING_THRESHOLD')
@@ -7,30 +7,33 @@ import pytest
 from utils.content_filter import BENIGN_COLLOCATIONS, ContentFilter
 
 
+@pytest.fixture(scope="module")
+def content_filter():
+    """One filter for the parametrized cases; it holds only module patterns."""
+    return ContentFilter()
+
+
 class TestContentFilter:
     """Tests for ContentFilter class"""
 
-    def test_safe_prompt_passes(self):
-        """Test that safe prompts are not blocked"""
-        content_filter = ContentFilter()
-
-        safe_prompts = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "a beautiful sunset over the ocean",
             "a cute cat playing with yarn",
             "a mountain landscape with snow-capped peaks",
             "a futuristic city with flying cars",
             "a portrait of a smiling person",
-            "abstract geometric shapes in vibrant colors"
-        ]
-
-        for prompt in safe_prompts:
-            assert content_filter.check_prompt(prompt) is False, f"Safe prompt was blocked: {prompt}"
-
-    def test_nsfw_keywords_blocked(self):
-        """Test that NSFW keywords are blocked"""
-        content_filter = ContentFilter()
+            "abstract geometric shapes in vibrant colors",
+        ],
+    )
+    def test_safe_prompt_passes(self, content_filter, prompt):
+        """Test that safe prompts are not blocked"""
+        assert content_filter.check_prompt(prompt) is False, f"Safe prompt was blocked: {prompt}"
 
-        nsfw_prompts = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "a nude portrait",
             "naked person on beach",
             "NSFW content warning",
@@ -40,53 +43,51 @@ class TestContentFilter:
             "XXX rated scene",
             "erotic art",
             "adult content only",
-            "lewd anime character"
-        ]
-
-        for prompt in nsfw_prompts:
-            assert content_filter.check_prompt(prompt) is True, f"NSFW prompt was not blocked: {prompt}"
-
-    def test_violence_keywords_blocked(self):
-        """Test that violent content keywords are blocked"""
-        content_filter = ContentFilter()
+            "lewd anime character",
+        ],
+    )
+    def test_nsfw_keywords_blocked(self, content_filter, prompt):
+        """Test that NSFW keywords are blocked"""
+        assert content_filter.check_prompt(prompt) is True, f"NSFW prompt was not blocked: {prompt}"
 
-        violent_prompts = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "gore and blood scene",
             "violent battle",
             "gruesome injury",
-            "mutilated body"
-        ]
-
-        for prompt in violent_prompts:
-            assert content_filter.check_prompt(prompt) is True, f"Violent prompt was not blocked: {prompt}"
-
-    def test_hate_keywords_blocked(self):
-        """Test that hate speech keywords are blocked"""
-        content_filter = ContentFilter()
+            "mutilated body",
+        ],
+    )
+    def test_violence_keywords_blocked(self, content_filter, prompt):
+        """Test that violent content keywords are blocked"""
+        assert content_filter.check_prompt(prompt) is True, f"Violent prompt was not blocked: {prompt}"
 
-        hate_prompts = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "hate speech example",
             "racist imagery",
             "offensive content",
-            "discriminatory message"
-        ]
-
-        for prompt in hate_prompts:
-            assert content_filter.check_prompt(prompt) is True, f"Hate prompt was not blocked: {prompt}"
-
-    def test_case_insensitive_filtering(self):
-        """Test that filtering is case-insensitive"""
-        content_filter = ContentFilter()
+            "discriminatory message",
+        ],
+    )
+    def test_hate_keywords_blocked(self, content_filter, prompt):
+        """Test that hate speech keywords are blocked"""
+        assert content_filter.check_prompt(prompt) is True, f"Hate prompt was not blocked: {prompt}"
 
-        variants = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "NUDE portrait",
             "Nude Portrait",
             "nude PORTRAIT",
-            "nUdE pOrTrAiT"
-        ]
-
-        for prompt in variants:
-            assert content_filter.check_prompt(prompt) is True, f"Case variant was not blocked: {prompt}"
+            "nUdE pOrTrAiT",
+        ],
+    )
+    def test_case_insensitive_filtering(self, content_filter, prompt):
+        """Test that filtering is case-insensitive"""
+        assert content_filter.check_prompt(prompt) is True, f"Case variant was not blocked: {prompt}"
 
     def test_empty_prompt_is_safe(self):
         """Test that empty prompts are considered safe"""
@@ -95,6 +96,15 @@ class TestContentFilter:
         assert content_filter.check_prompt("") is False
         assert content_filter.check_prompt(None) is False
 
+    def test_short_prompts_are_measured_after_normalization(self):
+        """Prompts too short for any keyword return early, but the length is
+        the normalized one: fullwidth letters fold to ASCII and still match."""
+        content_filter = ContentFilter()
+
+        assert content_filter.check_prompt("xx") is False
+        assert content_filter.check_prompt("xxx") is True
+        assert content_filter.check_prompt("\uff58\uff58\uff58") is True  # fullwidth "xxx"
+
     def test_keyword_within_larger_prompt(self):
         """Test that keywords are detected within larger prompts"""
         content_filter = ContentFilter()
@@ -138,11 +148,9 @@ class TestContentFilter:
         # Should be blocked (contains multiple keywords)
         assert content_filter.check_prompt(prompt) is True
 
-    def test_whitespace_and_punctuation(self):
-        """Test that keywords work with various whitespace and punctuation"""
-        content_filter = ContentFilter()
-
-        prompts = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "nude!",
             "nude?",
             "nude.",
@@ -150,11 +158,12 @@ class TestContentFilter:
             "  nude  ",
             "\tnude\n",
             "(nude)",
-            "[nude]"
-        ]
-
-        for prompt in prompts:
-            assert content_filter.check_prompt(prompt) is True, f"Keyword with punctuation not blocked: {repr(prompt)}"
+            "[nude]",
+        ],
+    )
+    def test_whitespace_and_punctuation(self, content_filter, prompt):
+        """Test that keywords work with various whitespace and punctuation"""
+        assert content_filter.check_prompt(prompt) is True, f"Keyword with punctuation not blocked: {repr(prompt)}"
 
 
 class TestContentFilterEvasion:
@@ -182,23 +191,31 @@ class TestContentFilterEvasion:
         assert content_filter.check_prompt("nud\u00e9") is True  # nudé
         assert content_filter.check_prompt("gor\u00e9") is True  # goré
 
+    def test_compatibility_forms_are_folded_not_just_accents(self):
+        """Fullwidth letters and ligatures decompose under NFKD, not just
+        accented vowels -- the reason the fold is not a hand-written table."""
+        content_filter = ContentFilter()
+        assert content_filter.check_prompt("\uff4e\uff55\uff44\uff45") is True  # ｎｕｄｅ
+        assert content_filter.check_prompt("o\ufb00ensive") is True  # oﬀensive
+
     def test_combined_evasion(self):
         content_filter = ContentFilter()
         # Leetspeak + spacing
         assert content_filter.check_prompt("n.u.d.3") is True
         assert content_filter.check_prompt("3 x p l 1 c 1 t") is True
 
-    def test_clean_prompts_still_pass(self):
-        content_filter = ContentFilter()
-        safe = [
+    @pytest.mark.parametrize(
+        "prompt",
+        [
             "a beautiful landscape with mountains",
             "a cat sitting on a window sill",
             "abstract art with bright colors",
             "a futuristic robot in a garden",
             "a painting of a sunset at the beach",
-        ]
-        for prompt in safe:
-            assert content_filter.check_prompt(prompt) is False, f"Clean prompt blocked: {prompt}"
+        ],
+    )
+    def test_clean_prompts_still_pass(self, content_filter, prompt):
+        assert content_filter.check_prompt(prompt) is False, f"Clean prompt blocked: {prompt}"
 
 
 # ---------------------------------------------------------------------------
@@ -386,3 +403,66 @@ def test_every_listed_collocation_passes_in_both_forms():
         p for p in BENIGN_COLLOCATIONS if f.check_prompt(p) or f.check_prompt(f"{p}s")
     ]
     assert not failures, f"listed collocations rejected: {failures}"
+
+
+def _one_pattern_per_keyword(prompt):
+    """The filter as it was written before each tier became one alternation."""
+    import re
+
+    from utils.content_filter import (
+        CONTEXT_DEPENDENT_KEYWORDS,
+        UNAMBIGUOUS_KEYWORDS,
+        _normalize_base,
+        _normalize_words,
+    )
+
+    def word(p):
+        return re.compile(r"\b" + re.escape(_normalize_words(p)) + r"\b")
+
+    words = _normalize_words(prompt)
+    if any(word(kw).search(words) for kw in UNAMBIGUOUS_KEYWORDS):
+        return True
+    residue = words
+    for p in BENIGN_COLLOCATIONS:
+        residue = re.sub(r"\b" + re.escape(_normalize_words(p)) + r"s?\b", " ", residue)
+    if any(word(kw).search(residue) for kw in CONTEXT_DEPENDENT_KEYWORDS):
+        return True
+    collapsed_keywords = {
+        re.sub(r"\s+", "", _normalize_words(kw))
+        for kw in (*UNAMBIGUOUS_KEYWORDS, *CONTEXT_DEPENDENT_KEYWORDS)
+    }
+    for m in re.finditer(r"(?:\w[\s\-_\.]+){2,}\w", _normalize_base(prompt)):
+        collapsed = re.sub(r"[\s\-_\.]+", "", m.group())
+        if any(kw in collapsed for kw in collapsed_keywords):
+            return True
+    return False
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "a cold blood red sky",
+        "bad blood moon",
+        "charm offensive line",
+        "al gore tex jacket",
+        "blood oranges and blood",
+        "violent storms over a violent sea",
+        "n.u.d.e portrait",
+        "b l o o d moon",
+        "nudes",
+        "a bloodhound in gore-tex",
+        "s3xual dimorphism in birds",
+        "an xxx-large t-shirt",
+        "hateful",
+        "",
+    ],
+)
+def test_combined_patterns_decide_as_one_pattern_per_keyword_did(prompt):
+    """One scan per tier must block exactly what one scan per keyword did.
+
+    Overlapping collocations are the case to watch: a single substitution
+    removes the leftmost of two overlapping entries where the old loop removed
+    whichever was listed first. Every collocation contains its keyword, so
+    either way the keyword goes -- these prompts hold the filter to that.
+    """
+    assert ContentFilter().check_prompt(prompt) is _one_pattern_per_keyword(prompt)
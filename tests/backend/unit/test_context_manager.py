@@ -6,12 +6,20 @@ Tests assert on observable behavior (data in S3) not call_args.
 """
 
 import json
+from unittest.mock import patch
 
 import pytest
+from botocore.exceptions import ClientError
 
 from models.context import ContextManager, create_context_entry
 
 
+@pytest.fixture
+def mock_s3(moto_s3_bucket):
+    """S3 is the only service here: shared backend, bucket per test (see conftest)."""
+    return moto_s3_bucket
+
+
 class TestContextManager:
     """Tests for ContextManager functionality using moto-backed S3."""
 
@@ -134,6 +142,34 @@ class TestContextManager:
         assert len(gemini_ctx) == 1
         assert gemini_ctx[0].prompt == 'gemini prompt'
 
+    def test_a_concurrent_conditional_write_is_retried_not_raised(self, context_manager, mock_s3):
+        """A 409 from a racing conditional PUT is a lost race, like a 412.
+
+        S3 reports two conditional writes in flight on one key as
+        ConditionalRequestConflict rather than PreconditionFailed. Either way
+        the entry must be merged on a re-read, never surfaced as an error.
+        """
+        s3, bucket = mock_s3
+        context_manager.add_entry('session-123', 'flux', create_context_entry(0, 'p0', 'k0'))
+
+        real_put = s3.put_object
+        attempts = []
+
+        def racing_put(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise ClientError(
+                    {'Error': {'Code': 'ConditionalRequestConflict', 'Message': 'conflict'}},
+                    'PutObject',
+                )
+            return real_put(**kwargs)
+
+        with patch.object(s3, 'put_object', side_effect=racing_put), patch('models.context.time.sleep'):
+            context_manager.add_entry('session-123', 'flux', create_context_entry(1, 'p1', 'k1'))
+
+        assert len(attempts) == 2
+        assert [e.iteration for e in context_manager.get_context('session-123', 'flux')] == [0, 1]
+
 
 class TestCreateContextEntry:
     """Tests for create_context_entry factory function."""
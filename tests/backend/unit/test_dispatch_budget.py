@@ -23,9 +23,7 @@ E2E suite), and raising there would enforce a constraint that does not apply.
 """
 
 import importlib
-import os
 import pathlib
-from unittest.mock import patch
 
 import pytest
 import yaml
@@ -179,7 +177,7 @@ def test_the_configured_ceiling_matches_the_template():
     ],
 )
 def test_the_deployed_combination_is_classified_correctly(
-    api_client_timeout, generate_async, expected_valid
+    api_client_timeout, generate_async, expected_valid, monkeypatch
 ):
     """The invariant as a pure function of two inputs, not an import-time raise.
 
@@ -194,20 +192,21 @@ def test_the_deployed_combination_is_classified_correctly(
         "AUTH_ENABLED": "false",
         "S3_BUCKET": "test-bucket",
     }
-    with patch.dict(os.environ, env):
-        config = _reload_config()
-
-        assert config.api_client_timeout == api_client_timeout
-        assert config.generate_async is generate_async
-        assert config.generate_dispatch_budget_seconds == api_client_timeout + 10
-
-        # A configuration is sound when the dispatch is asynchronous -- no
-        # gateway sits in front of it -- or when the synchronous budget fits
-        # under the ceiling.
-        sound = config.generate_async or config.sync_mode_fits_gateway(
-            config.generate_dispatch_budget_seconds
-        )
-        assert sound is expected_valid
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    config = _reload_config()
+
+    assert config.api_client_timeout == api_client_timeout
+    assert config.generate_async is generate_async
+    assert config.generate_dispatch_budget_seconds == api_client_timeout + 10
+
+    # A configuration is sound when the dispatch is asynchronous -- no
+    # gateway sits in front of it -- or when the synchronous budget fits
+    # under the ceiling.
+    sound = config.generate_async or config.sync_mode_fits_gateway(
+        config.generate_dispatch_budget_seconds
+    )
+    assert sound is expected_valid
 
 
 @pytest.mark.parametrize(
@@ -226,7 +225,7 @@ def test_the_predicate_is_a_pure_function_of_the_budget(budget, fits):
     assert config.sync_mode_fits_gateway(budget) is fits
 
 
-def test_importing_config_in_synchronous_mode_does_not_raise():
+def test_importing_config_in_synchronous_mode_does_not_raise(monkeypatch):
     """GENERATE_ASYNC=false must stay usable at the shipped API_CLIENT_TIMEOUT.
 
     This is the escape hatch `sam local start-api` and the MiniStack E2E suite
@@ -238,26 +237,28 @@ def test_importing_config_in_synchronous_mode_does_not_raise():
         "AUTH_ENABLED": "false",
         "S3_BUCKET": "test-bucket",
     }
-    with patch.dict(os.environ, env):
-        os.environ.pop("API_CLIENT_TIMEOUT", None)
-        config = _reload_config()
-
-        assert config.generate_async is False
-        assert config.api_client_timeout == 60.0
-        # The combination the invariant calls invalid -- and it still imports.
-        assert (
-            config.sync_mode_fits_gateway(config.generate_dispatch_budget_seconds)
-            is False
-        )
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("API_CLIENT_TIMEOUT", raising=False)
+    config = _reload_config()
+
+    assert config.generate_async is False
+    assert config.api_client_timeout == 60.0
+    # The combination the invariant calls invalid -- and it still imports.
+    assert (
+        config.sync_mode_fits_gateway(config.generate_dispatch_budget_seconds)
+        is False
+    )
 
 
-def test_generate_async_defaults_to_true():
+def test_generate_async_defaults_to_true(monkeypatch):
     env = {"AUTH_ENABLED": "false", "S3_BUCKET": "test-bucket"}
-    with patch.dict(os.environ, env):
-        os.environ.pop("GENERATE_ASYNC", None)
-        config = _reload_config()
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("GENERATE_ASYNC", raising=False)
+    config = _reload_config()
 
-        assert config.generate_async is True
+    assert config.generate_async is True
 
 
 # ---- The self-invoke grant must not drift from FunctionName ----
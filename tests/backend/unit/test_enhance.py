@@ -2,303 +2,233 @@
 Unit tests for prompt enhancement API
 """
 
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
-from api.enhance import PromptEnhancer
-
-
-class TestPromptEnhancer:
-    """Tests for PromptEnhancer class"""
-
-    def test_enhance_with_openai_provider(self):
-        """Test prompt enhancement using OpenAI provider"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-openai-key'):
+import pytest
 
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+import api.enhance
+from api.enhance import PromptEnhancer
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "A majestic orange tabby cat with striking green eyes"
-                mock_client.chat.completions.create.return_value = mock_response
 
-                result = enhancer.enhance("cat")
+def _use_prompt_model(monkeypatch, provider, model_id, api_key):
+    """Configure ``api.enhance``'s prompt model for one test.
+
+    monkeypatch rather than three nested ``patch()`` blocks: these are plain
+    module attributes, and it undoes them at teardown all the same.
+    """
+    monkeypatch.setattr(api.enhance, 'prompt_model_provider', provider)
+    monkeypatch.setattr(api.enhance, 'prompt_model_id', model_id)
+    monkeypatch.setattr(api.enhance, 'prompt_model_api_key', api_key)
+
+
+@pytest.fixture(scope="module")
+def unconfigured_enhancer():
+    """One enhancer with no prompt model, shared by the tests that only read it.
+
+    ``__init__`` is the only place ``PromptEnhancer`` consults config; after
+    that an unconfigured instance returns its input and holds no state a call
+    could change. Built inside ``MonkeyPatch.context`` because the
+    function-scoped ``monkeypatch`` is not available at module scope.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        _use_prompt_model(mp, '', '', '')
+        return PromptEnhancer()
+
+
+@pytest.fixture
+def openai_client(monkeypatch):
+    """An OpenAI prompt model configured on ``api.enhance``, and the stub
+    client ``get_openai_client`` hands back for it.
+
+    The OpenAI cases below differ only in what the completion returns and in
+    what they assert, so the configuration and client scaffolding live here
+    once instead of in every test.
+    """
+    _use_prompt_model(monkeypatch, 'openai', 'gpt-4o-mini', 'test-openai-key')
+    client = Mock()
+    monkeypatch.setattr(api.enhance, "get_openai_client", Mock(return_value=client))
+    return client
+
+
+def _completion(content):
+    """A chat completion carrying ``content``.
+
+    SimpleNamespace, not Mock: nothing asserts on the response, and a Mock
+    would answer any attribute the code under test misspelled.
+    """
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _gemini_response(*texts):
+    """A generate_content response with one candidate per text."""
+    return SimpleNamespace(
+        candidates=[SimpleNamespace(content=SimpleNamespace(parts=[SimpleNamespace(text=t)])) for t in texts]
+    )
+
+
+@pytest.mark.parametrize(
+    "method, prompt, content, error, expected",
+    [
+        ("enhance", "cat", "A majestic orange tabby cat with striking green eyes",
+         None, "A majestic orange tabby cat with striking green eyes"),
+        ("enhance", "test", "\n\n  Enhanced prompt with whitespace  \n\n",
+         None, "Enhanced prompt with whitespace"),
+        ("enhance", "original prompt", None, Exception("API Error"), "original prompt"),
+        ("enhance_safe", "short", "Enhanced version", None, "Enhanced version"),
+    ],
+    ids=["enhanced", "strips-whitespace", "original-on-error", "enhance-safe-success"],
+)
+def test_openai_enhancement_outcomes(openai_client, method, prompt, content, error, expected):
+    """What the caller gets back: the stripped completion, or the original
+    prompt when the provider call raises."""
+    create = openai_client.chat.completions.create
+    if error is not None:
+        create.side_effect = error
+    else:
+        create.return_value = _completion(content)
+
+    assert getattr(PromptEnhancer(), method)(prompt) == expected
+    create.assert_called_once()
+
+
+def test_openai_enhancement_request_shape(openai_client):
+    """The one request sent: configured model, system prompt then the user's
+    prompt, and the gpt-4o parameter set."""
+    create = openai_client.chat.completions.create
+    create.return_value = _completion("Enhanced")
+
+    PromptEnhancer().enhance("test")
+
+    kwargs = create.call_args.kwargs
+    assert kwargs['model'] == 'gpt-4o-mini'
+    messages = kwargs['messages']
+    assert len(messages) == 2
+    assert messages[0]['role'] == 'system'
+    assert messages[1]['role'] == 'user'
+    assert messages[1]['content'] == 'test'
+    # gpt-4o-mini matches "gpt-4o" branch -> max_completion_tokens
+    assert kwargs['max_completion_tokens'] == 200
+    assert kwargs['temperature'] == 0.7
 
-                assert result == "A majestic orange tabby cat with striking green eyes"
-                mock_client.chat.completions.create.assert_called_once()
 
-                call_args = mock_client.chat.completions.create.call_args
-                assert call_args.kwargs['model'] == 'gpt-4o-mini'
+class TestPromptEnhancer:
+    """Tests for PromptEnhancer class"""
 
-    def test_enhance_with_google_gemini_provider(self):
+    def test_enhance_with_google_gemini_provider(self, monkeypatch):
         """Test prompt enhancement using Google Gemini provider"""
-        with patch('api.enhance.prompt_model_provider', 'google_gemini'), \
-             patch('api.enhance.prompt_model_id', 'gemini-2.0-flash-exp'), \
-             patch('api.enhance.prompt_model_api_key', 'test-gemini-key'):
-
-            enhancer = PromptEnhancer()
+        _use_prompt_model(monkeypatch, 'google_gemini', 'gemini-2.0-flash-exp', 'test-gemini-key')
 
-            with patch('api.enhance.get_genai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        enhancer = PromptEnhancer()
 
-                mock_response = Mock()
-                mock_candidate = Mock()
-                mock_part = Mock()
-                mock_part.text = "A breathtaking sunset over a calm ocean with vibrant colors"
-                mock_candidate.content.parts = [mock_part]
-                mock_response.candidates = [mock_candidate]
+        with patch('api.enhance.get_genai_client') as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
 
-                mock_client.models.generate_content.return_value = mock_response
+            mock_client.models.generate_content.return_value = _gemini_response(
+                "A breathtaking sunset over a calm ocean with vibrant colors"
+            )
 
-                result = enhancer.enhance("sunset")
+            result = enhancer.enhance("sunset")
 
-                assert result == "A breathtaking sunset over a calm ocean with vibrant colors"
-                mock_client.models.generate_content.assert_called_once()
+            assert result == "A breathtaking sunset over a calm ocean with vibrant colors"
+            mock_client.models.generate_content.assert_called_once()
 
-    def test_enhance_with_custom_base_url(self):
+    def test_enhance_with_custom_base_url(self, monkeypatch):
         """Test enhancement with OpenAI-compatible provider using custom base_url"""
-        with patch('api.enhance.prompt_model_provider', 'generic'), \
-             patch('api.enhance.prompt_model_id', 'custom-model'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
-
-            enhancer = PromptEnhancer()
-            # Manually add base_url for testing
-            enhancer.prompt_model['base_url'] = 'https://custom-api.example.com/v1'
+        _use_prompt_model(monkeypatch, 'generic', 'custom-model', 'test-key')
 
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        enhancer = PromptEnhancer()
+        # Manually add base_url for testing
+        enhancer.prompt_model['base_url'] = 'https://custom-api.example.com/v1'
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "Enhanced prompt text"
-                mock_client.chat.completions.create.return_value = mock_response
+        with patch('api.enhance.get_openai_client') as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
 
-                result = enhancer.enhance("test")
+            mock_client.chat.completions.create.return_value = _completion("Enhanced prompt text")
 
-                call_args = mock_get_client.call_args
-                assert call_args.kwargs['base_url'] == 'https://custom-api.example.com/v1'
-                assert result == "Enhanced prompt text"
+            result = enhancer.enhance("test")
 
-    def test_enhance_returns_original_on_error(self):
-        """Test that enhance returns original prompt if enhancement fails"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
+            call_args = mock_get_client.call_args
+            assert call_args.kwargs['base_url'] == 'https://custom-api.example.com/v1'
+            assert result == "Enhanced prompt text"
 
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
-
-                mock_client.chat.completions.create.side_effect = Exception("API Error")
-
-                result = enhancer.enhance("original prompt")
-
-                assert result == "original prompt"
-
-    def test_enhance_with_no_prompt_model(self):
+    def test_enhance_with_no_prompt_model(self, unconfigured_enhancer):
         """Test enhancement when no prompt model is configured"""
-        with patch('api.enhance.prompt_model_provider', ''), \
-             patch('api.enhance.prompt_model_id', ''), \
-             patch('api.enhance.prompt_model_api_key', ''):
-
-            enhancer = PromptEnhancer()
+        enhancer = unconfigured_enhancer
 
-            result = enhancer.enhance("test prompt")
+        result = enhancer.enhance("test prompt")
 
-            assert result == "test prompt"
+        assert result == "test prompt"
 
-    def test_enhance_with_empty_prompt(self):
+    def test_enhance_with_empty_prompt(self, unconfigured_enhancer):
         """Test enhancement with empty prompt"""
-        with patch('api.enhance.prompt_model_provider', ''), \
-             patch('api.enhance.prompt_model_id', ''), \
-             patch('api.enhance.prompt_model_api_key', ''):
+        enhancer = unconfigured_enhancer
 
-            enhancer = PromptEnhancer()
+        assert enhancer.enhance("") is None
+        assert enhancer.enhance(None) is None
 
-            assert enhancer.enhance("") is None
-            assert enhancer.enhance(None) is None
-
-    def test_enhance_safe_never_returns_none(self):
+    def test_enhance_safe_never_returns_none(self, unconfigured_enhancer):
         """Test that enhance_safe always returns a string"""
-        with patch('api.enhance.prompt_model_provider', ''), \
-             patch('api.enhance.prompt_model_id', ''), \
-             patch('api.enhance.prompt_model_api_key', ''):
-
-            enhancer = PromptEnhancer()
-
-            result = enhancer.enhance_safe("test")
-            assert result == "test"
-            assert result is not None
-
-            result = enhancer.enhance_safe("")
-            assert result == ""
-            assert result is not None
-
-    def test_enhance_safe_returns_enhanced_when_successful(self):
-        """Test that enhance_safe returns enhanced prompt on success"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
+        enhancer = unconfigured_enhancer
 
-            enhancer = PromptEnhancer()
+        result = enhancer.enhance_safe("test")
+        assert result == "test"
+        assert result is not None
 
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        result = enhancer.enhance_safe("")
+        assert result == ""
+        assert result is not None
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "Enhanced version"
-                mock_client.chat.completions.create.return_value = mock_response
-
-                result = enhancer.enhance_safe("short")
-
-                assert result == "Enhanced version"
-
-    def test_enhance_with_gemini_empty_candidates(self):
+    def test_enhance_with_gemini_empty_candidates(self, monkeypatch):
         """Test handling of empty candidates from Gemini"""
-        with patch('api.enhance.prompt_model_provider', 'google_gemini'), \
-             patch('api.enhance.prompt_model_id', 'gemini-2.0-flash-exp'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
-
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_genai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
-
-                mock_response = Mock()
-                mock_response.candidates = []
-
-                mock_client.models.generate_content.return_value = mock_response
-
-                result = enhancer.enhance("test")
-
-                assert result == "test"
-
-    def test_enhance_includes_system_prompt(self):
-        """Test that enhancement includes the system prompt"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
-
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        _use_prompt_model(monkeypatch, 'google_gemini', 'gemini-2.0-flash-exp', 'test-key')
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "Enhanced"
-                mock_client.chat.completions.create.return_value = mock_response
+        enhancer = PromptEnhancer()
 
-                enhancer.enhance("test")
+        with patch('api.enhance.get_genai_client') as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
 
-                call_args = mock_client.chat.completions.create.call_args
-                messages = call_args.kwargs['messages']
+            mock_client.models.generate_content.return_value = _gemini_response()
 
-                assert len(messages) == 2
-                assert messages[0]['role'] == 'system'
-                assert messages[1]['role'] == 'user'
-                assert messages[1]['content'] == 'test'
+            result = enhancer.enhance("test")
 
-    def test_enhance_uses_correct_parameters(self):
-        """Test that enhancement uses correct API parameters"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
-
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
-
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "Enhanced"
-                mock_client.chat.completions.create.return_value = mock_response
-
-                enhancer.enhance("test")
-
-                call_args = mock_client.chat.completions.create.call_args
-                # gpt-4o-mini matches "gpt-4o" branch -> max_completion_tokens
-                assert call_args.kwargs['max_completion_tokens'] == 200
-                assert call_args.kwargs['temperature'] == 0.7
-
-    def test_enhance_strips_whitespace_from_response(self):
-        """Test that enhanced prompts have whitespace stripped"""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'):
-
-            enhancer = PromptEnhancer()
-
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
-
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "\n\n  Enhanced prompt with whitespace  \n\n"
-                mock_client.chat.completions.create.return_value = mock_response
-
-                result = enhancer.enhance("test")
-
-                assert result == "Enhanced prompt with whitespace"
+            assert result == "test"
 
-    def test_enhance_uses_configurable_timeout(self):
+    def test_enhance_uses_configurable_timeout(self, monkeypatch):
         """Test that enhance uses enhance_timeout from config."""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'), \
-             patch('api.enhance.enhance_timeout', 15.0):
+        _use_prompt_model(monkeypatch, 'openai', 'gpt-4o-mini', 'test-key')
+        monkeypatch.setattr(api.enhance, 'enhance_timeout', 15.0)
 
-            enhancer = PromptEnhancer()
+        enhancer = PromptEnhancer()
 
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        with patch('api.enhance.get_openai_client') as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = "Enhanced"
-                mock_client.chat.completions.create.return_value = mock_response
+            mock_client.chat.completions.create.return_value = _completion("Enhanced")
 
-                enhancer.enhance("test")
+            enhancer.enhance("test")
 
-                call_args = mock_get_client.call_args
-                assert call_args.kwargs['timeout'] == 15.0
+            call_args = mock_get_client.call_args
+            assert call_args.kwargs['timeout'] == 15.0
 
-    def test_adapt_per_model_uses_configurable_timeout(self):
+    def test_adapt_per_model_uses_configurable_timeout(self, monkeypatch):
         """Test that adapt_per_model uses enhance_timeout from config."""
-        with patch('api.enhance.prompt_model_provider', 'openai'), \
-             patch('api.enhance.prompt_model_id', 'gpt-4o-mini'), \
-             patch('api.enhance.prompt_model_api_key', 'test-key'), \
-             patch('api.enhance.enhance_timeout', 42.0):
+        _use_prompt_model(monkeypatch, 'openai', 'gpt-4o-mini', 'test-key')
+        monkeypatch.setattr(api.enhance, 'enhance_timeout', 42.0)
 
-            enhancer = PromptEnhancer()
+        enhancer = PromptEnhancer()
 
-            with patch('api.enhance.get_openai_client') as mock_get_client:
-                mock_client = Mock()
-                mock_get_client.return_value = mock_client
+        with patch('api.enhance.get_openai_client') as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
 
-                mock_response = Mock()
-                mock_response.choices = [Mock()]
-                mock_response.choices[0].message.content = '{"gemini": "adapted"}'
-                mock_client.chat.completions.create.return_value = mock_response
+            mock_client.chat.completions.create.return_value = _completion('{"gemini": "adapted"}')
 
-                enhancer.adapt_per_model("test", ["gemini"])
+            enhancer.adapt_per_model("test", ["gemini"])
 
-                call_args = mock_get_client.call_args
-                assert call_args.kwargs['timeout'] == 42.0
+            call_args = mock_get_client.call_args
+            assert call_args.kwargs['timeout'] == 42.0
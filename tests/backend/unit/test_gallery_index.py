@@ -515,6 +515,46 @@ def test_concurrent_index_writes_do_not_lose_the_folder(wired_gallery):
     ]
 
 
+def test_the_index_write_overlaps_the_session_write(wired_gallery, monkeypatch):
+    """Indexing runs alongside complete_iteration, not ahead of it.
+
+    The index write waits for the session write to begin. Run in sequence,
+    that wait could only time out; run alongside, it is released at once.
+    The result still carries the folder, so the write was awaited too.
+    """
+    import threading
+    from unittest.mock import MagicMock
+
+    lambda_function, s3 = wired_gallery
+    key = "sessions/2026-01-01-00-00-00-abcd1234/gemini.png"
+    session_write_started = threading.Event()
+    overlapped = []
+
+    real_record = lambda_function._gallery_index.record_gallery
+
+    def record_after_session_write_starts(gallery_id):
+        overlapped.append(session_write_started.wait(timeout=5))
+        real_record(gallery_id)
+
+    monkeypatch.setattr(
+        lambda_function._gallery_index, "record_gallery", record_after_session_write_starts
+    )
+    monkeypatch.setattr(lambda_function.image_storage, "upload_image", lambda *a, **k: key)
+    sessions = MagicMock()
+    sessions.complete_iteration.side_effect = lambda *a, **k: session_write_started.set()
+    monkeypatch.setattr(lambda_function, "session_manager", sessions)
+    monkeypatch.setattr(lambda_function, "context_manager", MagicMock())
+
+    lambda_function._handle_successful_result(
+        "sess-1", "gemini", "a cat", {"image": "b64"}, 0, "t", 1.0, "public"
+    )
+
+    assert overlapped == [True]
+    assert lambda_function._gallery_index.list_recent(limit=10) == [
+        "2026-01-01-00-00-00-abcd1234"
+    ]
+
+
 def test_a_paused_backfill_resumes_instead_of_restarting(wired_gallery, monkeypatch):
     """A pass that runs out of time must not make the next one start over.
 
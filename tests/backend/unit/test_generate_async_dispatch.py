@@ -526,8 +526,24 @@ def test_an_unresolvable_model_is_marked_failed_on_the_session(stack):
 
     lambda_function.run_generation(_worker_event(modelNames=["gemini", "firefly"]))
 
-    stack["session"].add_iteration.assert_any_call("s1", "firefly", "a cat")
-    stack["session"].fail_iteration.assert_any_call("s1", "firefly", 0, "Model is not enabled")
+    stack["session"].add_failed_iteration.assert_called_once_with(
+        "s1", "firefly", "a cat", "Model is not enabled"
+    )
+
+
+def test_an_unresolvable_model_costs_one_session_write_not_two(stack):
+    """Nothing happens between reserving the row and failing it.
+
+    ``add_iteration`` then ``fail_iteration`` was two read/conditional-write
+    cycles for an ``in_progress`` state no reader could ever observe, and two
+    chances to collide with the provider threads writing the same object.
+    """
+    import lambda_function
+
+    lambda_function.run_generation(_worker_event(modelNames=["gemini", "firefly"]))
+
+    assert all(c.args[1] != "firefly" for c in stack["session"].add_iteration.call_args_list)
+    assert all(c.args[1] != "firefly" for c in stack["session"].fail_iteration.call_args_list)
 
 
 def test_an_unresolvable_model_is_not_dispatched_to_a_provider(stack):
@@ -560,12 +576,7 @@ def test_a_failed_session_write_for_an_unresolvable_model_is_not_fatal(stack):
     """The dispatch must survive it: the other models are still worth running."""
     import lambda_function
 
-    def _fail_only_firefly(session_id, model, prompt, **kwargs):
-        if model == "firefly":
-            raise RuntimeError("s3 down")
-        return 0
-
-    stack["session"].add_iteration.side_effect = _fail_only_firefly
+    stack["session"].add_failed_iteration.side_effect = RuntimeError("s3 down")
 
     results = lambda_function.run_generation(_worker_event(modelNames=["gemini", "firefly"]))
 
@@ -4,6 +4,8 @@ Unit tests for model handlers
 
 from unittest.mock import Mock, patch
 
+import pytest
+import requests
 import responses
 
 from models.providers import handle_google_gemini, handle_openai
@@ -11,6 +13,13 @@ from models.providers import handle_google_gemini, handle_openai
 from .fixtures.api_responses import SAMPLE_IMAGE_CONTENT
 
 
+def _openai_client(mock_openai):
+    """The stub client the patched ``OpenAI`` constructor returns."""
+    mock_client = Mock()
+    mock_openai.return_value = mock_client
+    return mock_client
+
+
 class TestOpenAIHandler:
     """Tests for OpenAI DALL-E 3 handler"""
 
@@ -26,14 +35,10 @@ class TestOpenAIHandler:
         )
 
         with patch('utils.clients.OpenAI') as mock_openai:
-            # Setup mock client
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            # Setup mock response
-            mock_response = Mock()
-            mock_response.data = [Mock(url="https://example.com/generated-image.png")]
-            mock_client.images.generate.return_value = mock_response
+            mock_client = _openai_client(mock_openai)
+            mock_client.images.generate.return_value = Mock(
+                data=[Mock(url="https://example.com/generated-image.png")]
+            )
 
             # Call handler
             result = handle_openai(mock_model_config, sample_prompt, sample_params)
@@ -52,50 +57,34 @@ class TestOpenAIHandler:
             assert call_kwargs['prompt'] == sample_prompt
             assert call_kwargs['size'] == '1024x1024'
 
-    def test_error_handling(self, mock_model_config, sample_prompt, sample_params):
-        """Test error handling in OpenAI handler"""
+    @pytest.mark.parametrize(
+        "side_effect, expected_fragment",
+        [
+            (Exception("API Error"), "API Error"),
+            (requests.Timeout("Timeout"), "Image download timeout"),
+        ],
+        ids=["api-error", "timeout"],
+    )
+    def test_error_handling(self, mock_model_config, sample_prompt, sample_params,
+                            side_effect, expected_fragment):
+        """A failed call comes back as an error result naming the model, and a
+        timeout is reported as one rather than as a generic failure."""
         with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            # Simulate API error
-            mock_client.images.generate.side_effect = Exception("API Error")
+            mock_client = _openai_client(mock_openai)
+            mock_client.images.generate.side_effect = side_effect
 
             result = handle_openai(mock_model_config, sample_prompt, sample_params)
 
             assert result['status'] == 'error'
-            assert 'error' in result
-            assert 'API Error' in result['error']
+            assert expected_fragment in result['error']
             assert result['model'] == 'dall-e-3'
 
-    def test_timeout_handling(self, mock_model_config, sample_prompt, sample_params):
-        """Test timeout error handling"""
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            # Simulate timeout
-            import requests
-            mock_client.images.generate.side_effect = requests.Timeout("Timeout")
-
-            result = handle_openai(mock_model_config, sample_prompt, sample_params)
-
-            assert result['status'] == 'error'
-            assert 'timeout' in result['error'].lower() or 'Timeout' in result['error']
-
 
 class TestGoogleHandlers:
     """Tests for Google AI handlers"""
 
-    def test_gemini_success(self, sample_prompt, sample_params):
+    def test_gemini_success(self, gemini_config, sample_prompt, sample_params):
         """Test successful Gemini image generation"""
-        gemini_config = {
-            'index': 1,
-            'provider': 'google_gemini',
-            'id': 'gemini-2.0-flash-exp',
-            'api_key': 'test-gemini-key'
-        }
-
         with patch('utils.clients.genai.Client') as mock_client_class:
             mock_client = Mock()
             mock_client_class.return_value = mock_client
@@ -119,15 +108,8 @@ class TestGoogleHandlers:
             assert 'image' in result
             assert result['provider'] == 'google_gemini'
 
-    def test_gemini_error(self, sample_prompt, sample_params):
+    def test_gemini_error(self, gemini_config, sample_prompt, sample_params):
         """Test Gemini error handling"""
-        gemini_config = {
-            'index': 1,
-            'provider': 'google_gemini',
-            'id': 'gemini-2.0-flash-exp',
-            'api_key': 'test-gemini-key'
-        }
-
         with patch('utils.clients.genai.Client') as mock_client_class:
             mock_client = Mock()
             mock_client_class.return_value = mock_client
@@ -5,48 +5,100 @@ Tests for get_iterate_handler dispatcher and individual iterate_* functions
 for each provider (google_gemini, openai).
 """
 
-from unittest.mock import Mock, patch
+import re
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 import responses
-
-from models.providers import get_iterate_handler, iterate_gemini, iterate_openai
+from google import genai
+from openai import OpenAI
+
+from models.providers import (
+    get_handler,
+    get_iterate_handler,
+    get_outpaint_handler,
+    handle_firefly,
+    handle_google_gemini,
+    handle_nova,
+    handle_openai,
+    iterate_firefly,
+    iterate_gemini,
+    iterate_nova,
+    iterate_openai,
+    outpaint_firefly,
+    outpaint_gemini,
+    outpaint_nova,
+    outpaint_openai,
+)
 
 from .fixtures.api_responses import SAMPLE_IMAGE_BASE64, SAMPLE_IMAGE_CONTENT
 
 
-class TestGetIterateHandler:
-    """Tests for get_iterate_handler dispatcher function."""
+def _gemini_response(*parts):
+    """A generate_content response whose first candidate carries ``parts``.
 
-    def test_returns_gemini_handler(self):
-        """Test get_iterate_handler returns correct handler for Google Gemini."""
-        handler = get_iterate_handler('google_gemini')
-        assert handler == iterate_gemini
+    SimpleNamespace rather than Mock: the handler only reads these, and a Mock
+    part would answer ``inline_data`` with a truthy Mock whether or not the
+    test set one.
+    """
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=list(parts)))])
 
-    def test_returns_openai_handler(self):
-        """Test get_iterate_handler returns correct handler for OpenAI."""
-        handler = get_iterate_handler('openai')
-        assert handler == iterate_openai
 
-    def test_raises_for_unknown_provider(self):
-        """Test get_iterate_handler raises ValueError for unknown provider."""
-        with pytest.raises(ValueError) as exc_info:
-            get_iterate_handler('unknown_provider')
-        assert 'No iteration handler' in str(exc_info.value)
-        assert 'unknown_provider' in str(exc_info.value)
+class TestGetIterateHandler:
+    """Tests for the provider -> handler dispatchers, as one table.
+
+    Every provider is checked for all three operations. The per-method tests
+    this replaces covered two iterate handlers and neither of the other
+    dispatchers, so a provider missing from one of those maps went unseen.
+    """
+
+    @pytest.mark.parametrize(
+        "dispatch, provider, expected",
+        [
+            (get_handler, "google_gemini", handle_google_gemini),
+            (get_handler, "bedrock_nova", handle_nova),
+            (get_handler, "openai", handle_openai),
+            (get_handler, "adobe_firefly", handle_firefly),
+            (get_iterate_handler, "google_gemini", iterate_gemini),
+            (get_iterate_handler, "bedrock_nova", iterate_nova),
+            (get_iterate_handler, "openai", iterate_openai),
+            (get_iterate_handler, "adobe_firefly", iterate_firefly),
+            (get_outpaint_handler, "google_gemini", outpaint_gemini),
+            (get_outpaint_handler, "bedrock_nova", outpaint_nova),
+            (get_outpaint_handler, "openai", outpaint_openai),
+            (get_outpaint_handler, "adobe_firefly", outpaint_firefly),
+        ],
+    )
+    def test_returns_the_provider_handler(self, dispatch, provider, expected):
+        assert dispatch(provider) is expected
+
+    @pytest.mark.parametrize(
+        "dispatch, message",
+        [
+            (get_handler, "Unknown provider"),
+            (get_iterate_handler, "No iteration handler"),
+            (get_outpaint_handler, "No outpaint handler"),
+        ],
+    )
+    @pytest.mark.parametrize("provider", ["unknown_provider", ""])
+    def test_raises_for_unknown_provider(self, dispatch, message, provider):
+        with pytest.raises(ValueError, match=f"{re.escape(message)}.*{re.escape(provider)}"):
+            dispatch(provider)
+
+    @pytest.mark.parametrize("dispatch", [get_handler, get_iterate_handler, get_outpaint_handler])
+    def test_every_configured_provider_has_a_handler(self, dispatch):
+        """Driven by config.MODELS rather than the table above, so a provider
+        added to the config but missing from a dispatcher fails here."""
+        from config import MODELS
+
+        for provider in {m.provider for m in MODELS.values()}:
+            assert callable(dispatch(provider)), provider
 
 
 class TestIterateGemini:
     """Tests for iterate_gemini handler."""
 
-    @pytest.fixture
-    def gemini_config(self):
-        return {
-            'provider': 'google_gemini',
-            'id': 'gemini-2.0-flash-exp',
-            'api_key': 'test-gemini-key'
-        }
-
     @pytest.fixture
     def sample_context(self):
         return [
@@ -54,125 +106,84 @@ class TestIterateGemini:
             {'iteration': 1, 'prompt': 'add trees', 'image_key': 'test/1.png'},
         ]
 
-    def test_successful_iteration(self, gemini_config, sample_context):
+    @pytest.fixture
+    def gemini_client(self, monkeypatch):
+        """The stub genai client, with the SDK's ``types`` module stubbed too.
+
+        Specced on the real ``genai.Client``, so a handler reaching for a
+        client attribute the SDK does not have fails here rather than in
+        production. The spec is one level deep; ``models`` and below are not.
+
+        ``types`` only builds request objects here; a Mock returns a Mock from
+        every constructor, which is all the handler needs to pass along.
+        """
+        client = Mock(spec=genai.Client)
+        monkeypatch.setattr('utils.clients.genai.Client', Mock(return_value=client))
+        monkeypatch.setattr('models.providers.gemini.types', Mock())
+        return client
+
+    def test_successful_iteration(self, gemini_config, sample_context, gemini_client):
         """Test successful image iteration with Gemini."""
-        with patch('utils.clients.genai.Client') as mock_client_class, \
-             patch('models.providers.gemini.types') as mock_types:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
-
-            # Mock types.Part methods
-            mock_types.Part.from_bytes.return_value = Mock()
-            mock_types.Part.from_text.return_value = Mock()
-            mock_types.GenerateContentConfig.return_value = Mock()
-
-            # Setup mock response with inline_data
-            mock_part = Mock()
-            mock_part.inline_data = Mock()
-            mock_part.inline_data.data = SAMPLE_IMAGE_CONTENT
+        gemini_client.models.generate_content.return_value = _gemini_response(
+            SimpleNamespace(inline_data=SimpleNamespace(data=SAMPLE_IMAGE_CONTENT))
+        )
 
-            mock_candidate = Mock()
-            mock_candidate.content.parts = [mock_part]
+        result = iterate_gemini(
+            gemini_config,
+            SAMPLE_IMAGE_BASE64,
+            "add a river",
+            sample_context
+        )
 
-            mock_response = Mock()
-            mock_response.candidates = [mock_candidate]
+        assert result['status'] == 'success'
+        assert 'image' in result
+        assert result['provider'] == 'google_gemini'
 
-            mock_client.models.generate_content.return_value = mock_response
+    def test_handles_api_error(self, gemini_config, sample_context, gemini_client):
+        """Test error handling when Gemini API fails."""
+        gemini_client.models.generate_content.side_effect = Exception("Gemini Error")
 
-            result = iterate_gemini(
-                gemini_config,
-                SAMPLE_IMAGE_BASE64,
-                "add a river",
-                sample_context
-            )
+        result = iterate_gemini(
+            gemini_config,
+            SAMPLE_IMAGE_BASE64,
+            "add a river",
+            sample_context
+        )
 
-            assert result['status'] == 'success'
-            assert 'image' in result
-            assert result['provider'] == 'google_gemini'
+        assert result['status'] == 'error'
+        assert 'error' in result
+        assert result['provider'] == 'google_gemini'
 
-    def test_handles_api_error(self, gemini_config, sample_context):
-        """Test error handling when Gemini API fails."""
-        with patch('utils.clients.genai.Client') as mock_client_class, \
-             patch('models.providers.gemini.types') as mock_types:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
-
-            # Mock types.Part methods
-            mock_types.Part.from_bytes.return_value = Mock()
-            mock_types.Part.from_text.return_value = Mock()
-            mock_types.GenerateContentConfig.return_value = Mock()
-
-            mock_client.models.generate_content.side_effect = Exception("Gemini Error")
-
-            result = iterate_gemini(
-                gemini_config,
-                SAMPLE_IMAGE_BASE64,
-                "add a river",
-                sample_context
-            )
-
-            assert result['status'] == 'error'
-            assert 'error' in result
-            assert result['provider'] == 'google_gemini'
-
-    def test_handles_empty_candidates(self, gemini_config, sample_context):
+    def test_handles_empty_candidates(self, gemini_config, sample_context, gemini_client):
         """Test error handling when Gemini returns empty candidates."""
-        with patch('utils.clients.genai.Client') as mock_client_class, \
-             patch('models.providers.gemini.types') as mock_types:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
-
-            # Mock types.Part methods
-            mock_types.Part.from_bytes.return_value = Mock()
-            mock_types.Part.from_text.return_value = Mock()
-            mock_types.GenerateContentConfig.return_value = Mock()
-
-            mock_response = Mock()
-            mock_response.candidates = []
-            mock_client.models.generate_content.return_value = mock_response
-
-            result = iterate_gemini(
-                gemini_config,
-                SAMPLE_IMAGE_BASE64,
-                "add a river",
-                sample_context
-            )
-
-            assert result['status'] == 'error'
-            assert 'empty' in result['error'].lower() or 'candidates' in result['error'].lower()
-
-    def test_handles_no_image_in_response(self, gemini_config, sample_context):
-        """Test error handling when Gemini returns no image data."""
-        with patch('utils.clients.genai.Client') as mock_client_class, \
-             patch('models.providers.gemini.types') as mock_types:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
+        gemini_client.models.generate_content.return_value = SimpleNamespace(candidates=[])
 
-            # Mock types.Part methods
-            mock_types.Part.from_bytes.return_value = Mock()
-            mock_types.Part.from_text.return_value = Mock()
-            mock_types.GenerateContentConfig.return_value = Mock()
-
-            # Response with candidate but no image data
-            mock_part = Mock()
-            mock_part.inline_data = None
+        result = iterate_gemini(
+            gemini_config,
+            SAMPLE_IMAGE_BASE64,
+            "add a river",
+            sample_context
+        )
 
-            mock_candidate = Mock()
-            mock_candidate.content.parts = [mock_part]
+        assert result['status'] == 'error'
+        assert 'empty' in result['error'].lower() or 'candidates' in result['error'].lower()
 
-            mock_response = Mock()
-            mock_response.candidates = [mock_candidate]
-            mock_client.models.generate_content.return_value = mock_response
+    def test_handles_no_image_in_response(self, gemini_config, sample_context, gemini_client):
+        """Test error handling when Gemini returns no image data."""
+        # Response with candidate but no image data
+        gemini_client.models.generate_content.return_value = _gemini_response(
+            SimpleNamespace(inline_data=None)
+        )
 
-            result = iterate_gemini(
-                gemini_config,
-                SAMPLE_IMAGE_BASE64,
-                "add a river",
-                sample_context
-            )
+        result = iterate_gemini(
+            gemini_config,
+            SAMPLE_IMAGE_BASE64,
+            "add a river",
+            sample_context
+        )
 
-            assert result['status'] == 'error'
-            assert 'image' in result['error'].lower() or 'data' in result['error'].lower()
+        assert result['status'] == 'error'
+        assert 'image' in result['error'].lower() or 'data' in result['error'].lower()
 
 
 class TestIterateOpenAI:
@@ -192,30 +203,41 @@ class TestIterateOpenAI:
             {'iteration': 0, 'prompt': 'a dog', 'image_key': 'test/0.png'},
         ]
 
-    def test_successful_iteration(self, openai_config, sample_context):
-        """Test successful image iteration with OpenAI."""
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            # Setup mock response with b64_json
-            mock_response = Mock()
-            mock_response.data = [Mock(b64_json=SAMPLE_IMAGE_BASE64, url=None)]
-            mock_client.images.edit.return_value = mock_response
+    @pytest.fixture
+    def openai_client(self, monkeypatch):
+        """The stub client ``utils.clients`` builds, specced on the real
+        ``OpenAI`` class for the same reason as ``gemini_client``."""
+        client = Mock(spec=OpenAI)
+        monkeypatch.setattr('utils.clients.OpenAI', Mock(return_value=client))
+        return client
+
+    @pytest.mark.parametrize(
+        "source_image",
+        [SAMPLE_IMAGE_BASE64, SAMPLE_IMAGE_CONTENT],
+        ids=["b64_str", "raw_bytes"],
+    )
+    def test_successful_iteration(self, openai_config, sample_context, source_image, openai_client):
+        """Test successful image iteration with OpenAI, from either form of
+        source image; both reach the API as the same raw bytes."""
+        # Setup mock response with b64_json
+        openai_client.images.edit.return_value = SimpleNamespace(
+            data=[SimpleNamespace(b64_json=SAMPLE_IMAGE_BASE64, url=None)]
+        )
 
-            result = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_BASE64,
-                "make the dog wear a hat",
-                sample_context
-            )
+        result = iterate_openai(
+            openai_config,
+            source_image,
+            "make the dog wear a hat",
+            sample_context
+        )
 
-            assert result['status'] == 'success'
-            assert 'image' in result
-            assert result['provider'] == 'openai'
+        assert result['status'] == 'success'
+        assert 'image' in result
+        assert result['provider'] == 'openai'
+        assert openai_client.images.edit.call_args.kwargs['image'] == SAMPLE_IMAGE_CONTENT
 
     @responses.activate
-    def test_successful_iteration_with_url(self, openai_config, sample_context):
+    def test_successful_iteration_with_url(self, openai_config, sample_context, openai_client):
         """Test iteration when OpenAI returns URL instead of b64_json."""
         # Mock image download
         responses.add(
@@ -225,118 +247,89 @@ class TestIterateOpenAI:
             status=200
         )
 
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            # Setup mock response with URL (no b64_json)
-            mock_data = Mock()
-            mock_data.b64_json = None
-            mock_data.url = "https://example.com/openai-result.png"
-            mock_response = Mock()
-            mock_response.data = [mock_data]
-            mock_client.images.edit.return_value = mock_response
-
-            result = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_BASE64,
-                "make the dog wear a hat",
-                sample_context
-            )
-
-            assert result['status'] == 'success'
-            assert 'image' in result
-
-    def test_handles_api_error(self, openai_config, sample_context):
+        # Setup mock response with URL (no b64_json)
+        openai_client.images.edit.return_value = SimpleNamespace(
+            data=[SimpleNamespace(b64_json=None, url="https://example.com/openai-result.png")]
+        )
+
+        result = iterate_openai(
+            openai_config,
+            SAMPLE_IMAGE_BASE64,
+            "make the dog wear a hat",
+            sample_context
+        )
+
+        assert result['status'] == 'success'
+        assert 'image' in result
+
+    def test_handles_api_error(self, openai_config, sample_context, openai_client):
         """Test error handling when OpenAI API fails."""
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-            mock_client.images.edit.side_effect = Exception("OpenAI API Error")
-
-            result = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_BASE64,
-                "make the dog wear a hat",
-                sample_context
-            )
-
-            assert result['status'] == 'error'
-            assert 'error' in result
-            assert result['provider'] == 'openai'
-
-    def test_handles_empty_response(self, openai_config, sample_context):
+        openai_client.images.edit.side_effect = Exception("OpenAI API Error")
+
+        result = iterate_openai(
+            openai_config,
+            SAMPLE_IMAGE_BASE64,
+            "make the dog wear a hat",
+            sample_context
+        )
+
+        assert result['status'] == 'error'
+        assert 'error' in result
+        assert result['provider'] == 'openai'
+
+    def test_handles_empty_response(self, openai_config, sample_context, openai_client):
         """Test error handling when OpenAI returns empty data."""
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.data = []
-            mock_client.images.edit.return_value = mock_response
-
-            result = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_BASE64,
-                "make the dog wear a hat",
-                sample_context
-            )
-
-            assert result['status'] == 'error'
-            assert 'empty' in result['error'].lower()
-
-    def test_accepts_base64_string_and_bytes(self, openai_config, sample_context):
-        """Test handler accepts both base64 string and bytes for source_image."""
-        with patch('utils.clients.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-
-            mock_response = Mock()
-            mock_response.data = [Mock(b64_json=SAMPLE_IMAGE_BASE64, url=None)]
-            mock_client.images.edit.return_value = mock_response
-
-            # Test with base64 string
-            result1 = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_BASE64,  # string
-                "test prompt",
-                sample_context
-            )
-            assert result1['status'] == 'success'
-
-            # Test with bytes
-            result2 = iterate_openai(
-                openai_config,
-                SAMPLE_IMAGE_CONTENT,  # bytes
-                "test prompt",
-                sample_context
-            )
-            assert result2['status'] == 'success'
+        openai_client.images.edit.return_value = SimpleNamespace(data=[])
+
+        result = iterate_openai(
+            openai_config,
+            SAMPLE_IMAGE_BASE64,
+            "make the dog wear a hat",
+            sample_context
+        )
+
+        assert result['status'] == 'error'
+        assert 'empty' in result['error'].lower()
 
 
 class TestIterateHandlerIntegration:
     """Integration tests for iteration handler pipeline."""
 
-    def test_all_handlers_return_consistent_format(self):
-        """Test that all iteration handlers return consistent response format."""
-        handlers = [
+    @pytest.mark.parametrize(
+        "provider, handler",
+        [
             ('google_gemini', iterate_gemini),
             ('openai', iterate_openai),
-        ]
-
-        for provider, handler in handlers:
-            config = {'provider': provider, 'id': 'test', 'api_key': 'test'}
-            context = []
-
-            # Each handler should gracefully handle errors
-            result = handler(config, SAMPLE_IMAGE_BASE64, "test prompt", context)
-
-            # All results should have these fields
-            assert 'status' in result, f"{provider} handler missing 'status'"
-            assert result['status'] in ['success', 'error'], f"{provider} has invalid status"
-            assert 'provider' in result, f"{provider} handler missing 'provider'"
-
-            if result['status'] == 'success':
-                assert 'image' in result, f"{provider} success missing 'image'"
-            else:
-                assert 'error' in result, f"{provider} error missing 'error' message"
+        ],
+    )
+    def test_all_handlers_return_consistent_format(self, provider, handler, monkeypatch):
+        """Test that all iteration handlers return consistent response format.
+
+        Both SDK clients are stubbed to fail the way an unreachable provider
+        does. Left real, this made live calls with a dummy key: slow where
+        there is a network, and answered by whatever the provider said that
+        day.
+        """
+        unreachable = ConnectionError("provider unreachable")
+        openai_client = Mock(spec=OpenAI)
+        openai_client.images.edit.side_effect = unreachable
+        genai_client = Mock(spec=genai.Client)
+        genai_client.models.generate_content.side_effect = unreachable
+        monkeypatch.setattr('utils.clients.OpenAI', Mock(return_value=openai_client))
+        monkeypatch.setattr('utils.clients.genai.Client', Mock(return_value=genai_client))
+
+        config = {'provider': provider, 'id': 'test', 'api_key': 'test'}
+        context = []
+
+        # Each handler should gracefully handle errors
+        result = handler(config, SAMPLE_IMAGE_BASE64, "test prompt", context)
+
+        # All results should have these fields
+        assert 'status' in result, f"{provider} handler missing 'status'"
+        assert result['status'] in ['success', 'error'], f"{provider} has invalid status"
+        assert 'provider' in result, f"{provider} handler missing 'provider'"
+
+        if result['status'] == 'success':
+            assert 'image' in result, f"{provider} success missing 'image'"
+        else:
+            assert 'error' in result, f"{provider} error missing 'error' message"
@@ -6,7 +6,7 @@ Mocks all module-level singletons to avoid real AWS calls.
 
 import json
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import boto3
 import pytest
@@ -61,23 +61,24 @@ def _body(resp):
 
 # Patch module-level singletons so importing lambda_function never hits AWS
 _MOD = "lambda_function"
-_TARGETS = [
-    f"{_MOD}.s3_client",
-    f"{_MOD}.session_manager",
-    f"{_MOD}.context_manager",
-    f"{_MOD}.image_storage",
-    f"{_MOD}.content_filter",
-    f"{_MOD}.prompt_enhancer",
-    f"{_MOD}._executor",
-    f"{_MOD}._gallery_executor",
-    f"{_MOD}.get_enabled_models",
-    f"{_MOD}.get_handler",
-    f"{_MOD}.get_iterate_handler",
-    f"{_MOD}.get_outpaint_handler",
-    f"{_MOD}.get_model",
-    f"{_MOD}.get_model_config_dict",
-    f"{_MOD}.handle_log",
-]
+# Every one replaced with a fresh MagicMock per test, in one patch.multiple.
+_PATCHED = (
+    "s3_client",
+    "session_manager",
+    "context_manager",
+    "image_storage",
+    "content_filter",
+    "prompt_enhancer",
+    "_executor",
+    "_gallery_executor",
+    "get_enabled_models",
+    "get_handler",
+    "get_iterate_handler",
+    "get_outpaint_handler",
+    "get_model",
+    "get_model_config_dict",
+    "handle_log",
+)
 
 
 _GALLERY_TABLE = "pixel-prompt-users-lambdatest"
@@ -129,30 +130,23 @@ def mocks():
         # exercising the cursor and limit semantics under test.
         _make_gallery_table()
 
-        patchers = []
-        m = {}
-        for target in _TARGETS:
-            p = patch(target)
-            obj = p.start()
-            patchers.append(p)
-            m[target.split(".")[-1]] = obj
+        # One patcher for all of them rather than one per name: patch.multiple
+        # resolves the module once and undoes every replacement on exit,
+        # including when a test fails.
+        with patch.multiple(_MOD, **dict.fromkeys(_PATCHED, DEFAULT)) as m:
+            # Sane defaults
+            m["content_filter"].check_prompt.return_value = False
+            m["get_enabled_models"].return_value = []
 
-        # Sane defaults
-        m["content_filter"].check_prompt.return_value = False
-        m["get_enabled_models"].return_value = []
+            import lambda_function as _lf
+            from gallery.repository import GalleryIndexRepository
 
-        import lambda_function as _lf
-        from gallery.repository import GalleryIndexRepository
-
-        _lf._gallery_index = GalleryIndexRepository(
-            _GALLERY_TABLE, dynamodb_resource=boto3.resource("dynamodb", region_name="us-east-1")
-        )
-        _lf._gallery_backfilled = False
-
-        yield m
+            _lf._gallery_index = GalleryIndexRepository(
+                _GALLERY_TABLE, dynamodb_resource=boto3.resource("dynamodb", region_name="us-east-1")
+            )
+            _lf._gallery_backfilled = False
 
-        for p in patchers:
-            p.stop()
+            yield m
 
 
 def _get_lambda_handler():
@@ -932,3 +926,30 @@ class TestGalleryListBound:
         ids = [g["id"] for g in _body(resp)["galleries"]]
         assert len(ids) == 5
         assert all(len(i) == 19 for i in ids)
+
+
+# ============================================================
+# Shared S3 client
+# ============================================================
+
+
+class TestSharedS3Client:
+    """Reloaded so the module-level wiring is real rather than patched."""
+
+    @pytest.fixture
+    def lf(self):
+        import importlib
+
+        import lambda_function
+
+        return importlib.reload(lambda_function)
+
+    def test_pool_covers_every_thread_that_shares_it(self, lf):
+        """Each generation thread and each gallery fetch can hold a connection."""
+        cfg = lf.s3_client.meta.config
+        assert cfg.max_pool_connections >= lf.generate_thread_workers + 4
+        assert cfg.tcp_keepalive is True
+
+    def test_managers_share_the_one_client(self, lf):
+        assert lf.session_manager.s3 is lf.s3_client
+        assert lf.context_manager.s3 is lf.s3_client
@@ -68,6 +68,21 @@ def test_handle_log_invalid_level():
         handle_log(body, 'test-correlation-123', '192.168.1.1')
 
 
+def test_handle_log_invalid_level_lists_levels_in_a_fixed_order():
+    """The rejection names the levels in one stable order, not set order."""
+    body = {
+        'level': 'TRACE',
+        'message': 'Test message'
+    }
+
+    with pytest.raises(ValueError) as excinfo:
+        handle_log(body, 'test-correlation-123', '192.168.1.1')
+
+    assert str(excinfo.value) == (
+        "Invalid log level 'TRACE'. Must be one of: ERROR, WARNING, INFO, DEBUG"
+    )
+
+
 def test_handle_log_valid_levels():
     """Test all valid log levels."""
     valid_levels = ['ERROR', 'WARNING', 'INFO', 'DEBUG']
@@ -161,3 +176,36 @@ def test_handle_log_with_custom_metadata():
         assert call_args[1]['action'] == 'render'
         assert call_args[1]['userAgent'] == 'Mozilla/5.0'
         assert call_args[1]['ip'] == '192.168.1.1'
+
+
+def test_handle_log_rejects_non_object_metadata():
+    """Metadata that is not an object is a client error, not a crash."""
+    body = {
+        'level': 'ERROR',
+        'message': 'Test error message',
+        'metadata': ['component', 'ErrorBoundary']
+    }
+
+    with patch('api.log.StructuredLogger.log') as mock_log:
+        with pytest.raises(ValueError, match="Field 'metadata' must be an object"):
+            handle_log(body, 'test-123', '192.168.1.1')
+
+    mock_log.assert_not_called()
+
+
+def test_handle_log_forwards_metadata_alongside_ip_and_stack():
+    """Metadata fields reach the logger next to ip and stack."""
+    body = {
+        'level': 'ERROR',
+        'message': 'Test error message',
+        'stack': 'Error: boom',
+        'metadata': {'component': 'ErrorBoundary'}
+    }
+
+    with patch('api.log.StructuredLogger.log') as mock_log:
+        handle_log(body, 'test-123', '192.168.1.1')
+
+    fields = mock_log.call_args[1]
+    assert fields['component'] == 'ErrorBoundary'
+    assert fields['ip'] == '192.168.1.1'
+    assert fields['stack'] == 'Error: boom'
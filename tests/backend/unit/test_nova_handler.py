@@ -9,7 +9,7 @@ from botocore.exceptions import ClientError
 
 from models.providers.nova import handle_nova, iterate_nova, outpaint_nova
 
-from .fixtures.api_responses import SAMPLE_IMAGE_BASE64
+from .fixtures.api_responses import BEDROCK_NOVA_RESPONSE_BYTES, SAMPLE_IMAGE_BASE64
 
 
 @pytest.fixture
@@ -17,18 +17,18 @@ def nova_config():
     return {"provider": "bedrock_nova", "id": "amazon.nova-canvas-v1:0", "api_key": ""}
 
 
-def _mock_invoke_response(payload: dict):
-    body = io.BytesIO(json.dumps(payload).encode("utf-8"))
-    return {"body": body}
+def _mock_invoke_response(payload: dict | bytes):
+    """A fresh body stream per call: the handler reads it to the end."""
+    if isinstance(payload, dict):
+        payload = json.dumps(payload).encode("utf-8")
+    return {"body": io.BytesIO(payload)}
 
 
 def test_handle_nova_success(nova_config):
     with patch("models.providers.nova.get_bedrock_client") as mock_client_factory:
         client = Mock()
         mock_client_factory.return_value = client
-        client.invoke_model.return_value = _mock_invoke_response(
-            {"images": [SAMPLE_IMAGE_BASE64]}
-        )
+        client.invoke_model.return_value = _mock_invoke_response(BEDROCK_NOVA_RESPONSE_BYTES)
 
         result = handle_nova(nova_config, "a sunset", {})
         assert result["status"] == "success"
@@ -66,9 +66,7 @@ def test_iterate_nova_uses_image_variation(nova_config):
     with patch("models.providers.nova.get_bedrock_client") as mock_client_factory:
         client = Mock()
         mock_client_factory.return_value = client
-        client.invoke_model.return_value = _mock_invoke_response(
-            {"images": [SAMPLE_IMAGE_BASE64]}
-        )
+        client.invoke_model.return_value = _mock_invoke_response(BEDROCK_NOVA_RESPONSE_BYTES)
 
         result = iterate_nova(nova_config, SAMPLE_IMAGE_BASE64, "edit", [])
         assert result["status"] == "success"
@@ -90,9 +88,7 @@ def test_outpaint_nova_uses_outpainting(nova_config):
     with patch("models.providers.nova.get_bedrock_client") as mock_client_factory:
         client = Mock()
         mock_client_factory.return_value = client
-        client.invoke_model.return_value = _mock_invoke_response(
-            {"images": [SAMPLE_IMAGE_BASE64]}
-        )
+        client.invoke_model.return_value = _mock_invoke_response(BEDROCK_NOVA_RESPONSE_BYTES)
 
         result = outpaint_nova(nova_config, real_png_bytes, "16:9", "extend")
         assert result["status"] == "success"
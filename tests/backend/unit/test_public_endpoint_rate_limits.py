@@ -332,6 +332,83 @@ def test_the_limiter_costs_one_write_per_request(wired):
     assert calls == ["update"], calls
 
 
+def test_a_refused_request_costs_one_operation_too(wired):
+    """The rejected update carries the item, so deciding "at the limit" needs no read.
+
+    The refused caller is the one hammering the endpoint; a GetItem per
+    refusal doubled the table load from exactly the traffic being refused.
+    """
+    repo = wired._user_repo
+    key = "iplimit#log#hammer"
+    for _ in range(3):
+        repo.increment_ip_rate_bucket(key, limit=3, window_seconds=100, now=1000)
+
+    calls: list[str] = []
+    table = repo._table
+    real_update, real_get = table.update_item, table.get_item
+
+    def rec(name, fn):
+        def wrapper(**kwargs):
+            calls.append(name)
+            return fn(**kwargs)
+
+        return wrapper
+
+    table.update_item = rec("update", real_update)
+    table.get_item = rec("get", real_get)
+
+    allowed, item = repo.increment_ip_rate_bucket(key, limit=3, window_seconds=100, now=1000)
+
+    assert allowed is False
+    assert int(item["requestCount"]) == 3
+    assert calls == ["update"], calls
+
+
+def test_a_known_refusal_is_answered_without_the_store(wired):
+    """Until its window ends, an exhausted bucket's answer cannot change."""
+    with patch.object(wired, "handle_log") as log_fn:
+        log_fn.return_value = {"success": True, "message": "ok"}
+        for _ in range(4):
+            wired.lambda_handler(_log_event(), None)
+
+        calls: list[str] = []
+        table = wired._user_repo._table
+        real_update = table.update_item
+
+        def rec(**kwargs):
+            calls.append("update")
+            return real_update(**kwargs)
+
+        table.update_item = rec
+
+        again = wired.lambda_handler(_log_event(), None)
+
+    assert again["statusCode"] == 429
+    assert int(again["headers"]["Retry-After"]) > 0
+    assert calls == []
+
+
+def test_a_known_refusal_lapses_with_its_window(wired):
+    """Once the window has ended the store decides again, and may allow."""
+    with patch.object(wired, "handle_log") as log_fn:
+        log_fn.return_value = {"success": True, "message": "ok"}
+        for _ in range(4):
+            wired.lambda_handler(_log_event(), None)
+
+        # Stand in for the clock passing the window end: the entry lapses and
+        # the bucket itself is rolled the way a real window would roll.
+        (key,) = wired._ip_refusals
+        wired._ip_refusals[key] = 0
+        wired._user_repo._table.update_item(
+            Key={"userId": key},
+            UpdateExpression="SET windowStart = :old",
+            ExpressionAttributeValues={":old": 0},
+        )
+
+        assert wired.lambda_handler(_log_event(), None)["statusCode"] == 200
+    assert key not in wired._ip_refusals
+
+
 def test_the_bucket_still_expires_with_its_window(wired):
     """Without the pre-created row, the TTL has to come from the update."""
     with patch.object(wired, "handle_log") as log_fn:
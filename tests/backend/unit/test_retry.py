@@ -10,7 +10,7 @@ asserting is the behaviour the lock must not change, which is cache identity.
 Same reasoning as the moto rule in the plan's Phase-0.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from botocore.exceptions import BotoCoreError, ClientError
@@ -21,6 +21,26 @@ from utils.retry import (
 )
 
 
+def scripted(*outcomes):
+    """A callable that returns or raises ``outcomes`` in order, counting calls.
+
+    What these tests used ``Mock(side_effect=[...])`` for, without the mock
+    machinery: the decorator under test only ever calls the function, so
+    there is nothing for a Mock to record that a counter does not.
+    """
+    remaining = iter(outcomes)
+
+    def fn(*_args, **_kwargs):
+        fn.calls += 1
+        outcome = next(remaining)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    fn.calls = 0
+    return fn
+
+
 class TestRetryableErrorDetection:
     """Tests for is_retryable_error function"""
 
@@ -71,75 +91,83 @@ class TestRetryableErrorDetection:
 class TestRetryDecorator:
     """Tests for retry_with_backoff decorator"""
 
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        """No test here is about waiting, so none of them does.
+
+        The backoff is real ``time.sleep`` in the decorator; left alone, every
+        retrying test slept through it. The two tests that assert on the
+        delays patch ``sleep`` themselves, which takes precedence inside
+        their ``with`` block.
+        """
+        monkeypatch.setattr("utils.retry.time.sleep", lambda _seconds: None)
+
     def test_successful_call_no_retry(self):
         """Test that successful calls don't retry"""
-        mock_func = Mock(return_value="success")
-        decorated = retry_with_backoff(max_retries=3)(mock_func)
+        func = scripted("success")
+        decorated = retry_with_backoff(max_retries=3)(func)
 
         result = decorated()
 
         assert result == "success"
-        assert mock_func.call_count == 1
+        assert func.calls == 1
 
     def test_retry_on_retryable_error(self):
         """Test that retryable errors trigger retries"""
-        mock_func = Mock()
         # Fail twice, then succeed
-        mock_func.side_effect = [
+        func = scripted(
             ConnectionError("Network error"),
             ConnectionError("Network error"),
             "success"
-        ]
+        )
 
-        decorated = retry_with_backoff(max_retries=3, base_delay=0.01)(mock_func)
+        decorated = retry_with_backoff(max_retries=3, base_delay=0.01)(func)
 
         result = decorated()
 
         assert result == "success"
-        assert mock_func.call_count == 3
+        assert func.calls == 3
 
     def test_max_retries_exhausted(self):
         """Test that max retries are respected"""
-        mock_func = Mock()
-        # Always fail with retryable error
-        mock_func.side_effect = ConnectionError("Network error")
+        # Always fail with retryable error; a fifth outcome is there so an
+        # extra attempt would fail on the count, not on an exhausted script.
+        func = scripted(*(ConnectionError("Network error") for _ in range(5)))
 
-        decorated = retry_with_backoff(max_retries=3, base_delay=0.01)(mock_func)
+        decorated = retry_with_backoff(max_retries=3, base_delay=0.01)(func)
 
         with pytest.raises(ConnectionError):
             decorated()
 
         # Initial call + 3 retries = 4 calls total
-        assert mock_func.call_count == 4
+        assert func.calls == 4
 
     def test_permanent_error_no_retry(self):
         """Test that permanent errors don't retry"""
-        mock_func = Mock()
         permanent_error = ClientError(
             {'Error': {'Code': 'AccessDenied'}, 'ResponseMetadata': {'HTTPStatusCode': 403}},
             'GetObject'
         )
-        mock_func.side_effect = permanent_error
+        func = scripted(permanent_error, permanent_error)
 
-        decorated = retry_with_backoff(max_retries=3)(mock_func)
+        decorated = retry_with_backoff(max_retries=3)(func)
 
         with pytest.raises(ClientError):
             decorated()
 
         # Should only call once (no retries)
-        assert mock_func.call_count == 1
+        assert func.calls == 1
 
     def test_exponential_backoff_delay(self):
         """Test that exponential backoff delays are applied"""
-        mock_func = Mock()
-        mock_func.side_effect = [
+        func = scripted(
             ConnectionError("Error 1"),
             ConnectionError("Error 2"),
             "success"
-        ]
+        )
 
         with patch('utils.retry.time.sleep') as mock_sleep:
-            decorated = retry_with_backoff(max_retries=3, base_delay=0.1, max_delay=1.0)(mock_func)
+            decorated = retry_with_backoff(max_retries=3, base_delay=0.1, max_delay=1.0)(func)
             result = decorated()
 
         assert result == "success"
@@ -150,20 +178,19 @@ class TestRetryDecorator:
 
     def test_max_delay_cap(self):
         """Test that max delay caps exponential growth"""
-        mock_func = Mock()
-        mock_func.side_effect = [
+        func = scripted(
             ConnectionError("Error"),
             ConnectionError("Error"),
             ConnectionError("Error"),
             "success"
-        ]
+        )
 
         with patch('utils.retry.time.sleep') as mock_sleep:
             decorated = retry_with_backoff(
                 max_retries=4,
                 base_delay=0.1,
                 max_delay=0.2  # Cap at 0.2s
-            )(mock_func)
+            )(func)
             result = decorated()
 
         assert result == "success"
@@ -174,18 +201,17 @@ class TestRetryDecorator:
 
     def test_correlation_id_logging(self):
         """Test that correlation ID is passed to StructuredLogger"""
-        mock_func = Mock()
-        mock_func.side_effect = [
+        func = scripted(
             ConnectionError("Network error"),
             "success"
-        ]
+        )
 
         with patch('utils.retry.StructuredLogger') as mock_logger:
             decorated = retry_with_backoff(
                 max_retries=3,
                 base_delay=0.01,
                 correlation_id="test-correlation-123"
-            )(mock_func)
+            )(func)
 
             result = decorated()
 
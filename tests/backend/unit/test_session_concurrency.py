@@ -55,6 +55,17 @@ def _session_doc(session_id="sess-1", iteration_count=0, iterations=None):
     }
 
 
+def _written(client) -> list[dict]:
+    """Every session document the stub was asked to write, decoded once.
+
+    Indexed like ``put_object.call_args_list``, so ``_written(client)[-1]`` is
+    the last write. Parsed with stdlib ``json`` on purpose: the manager may
+    encode with orjson or fall back to ``json``, and either must stay readable
+    by a plain JSON parser.
+    """
+    return [json.loads(c.kwargs["Body"]) for c in client.put_object.call_args_list]
+
+
 def _stub_client(doc, put_failures=0, read_etags=None):
     """An S3 client whose conditional write fails ``put_failures`` times.
 
@@ -242,6 +253,53 @@ def test_a_mutation_costs_two_round_trips_not_three():
     assert total == 2
 
 
+def test_a_failed_iteration_is_recorded_in_one_read_and_one_write():
+    client = _stub_client(_session_doc())
+    mgr = SessionManager(client, "bucket")
+
+    mgr.add_failed_iteration("sess-1", "gemini", "bluer", "Model is not enabled")
+
+    assert client.get_object.call_count == 1
+    assert client.put_object.call_count == 1
+    written = _written(client)[-1]
+    assert written["models"]["gemini"]["iterations"][0]["status"] == "error"
+
+
+def test_repeating_a_recorded_completion_costs_no_write():
+    """A redelivered completion reads the session and finds nothing to change."""
+    done = {"index": 0, "status": "completed", "prompt": "a cat", "imageKey": "k0.png"}
+    client = _stub_client(_session_doc(iteration_count=1, iterations=[done]))
+    mgr = SessionManager(client, "bucket")
+
+    mgr.complete_iteration("sess-1", "gemini", 0, "k0.png", duration=1.0)
+
+    assert client.get_object.call_count == 1
+    assert client.put_object.call_count == 0
+
+
+def test_repeating_a_recorded_failure_costs_no_write():
+    failed = {"index": 0, "status": "error", "prompt": "a cat", "error": "timeout"}
+    client = _stub_client(_session_doc(iteration_count=1, iterations=[failed]))
+    mgr = SessionManager(client, "bucket")
+
+    mgr.fail_iteration("sess-1", "gemini", 0, "timeout")
+
+    assert client.put_object.call_count == 0
+
+
+def test_a_different_result_for_a_recorded_iteration_is_still_written():
+    """Only an identical result is skipped; anything else still lands."""
+    done = {"index": 0, "status": "completed", "prompt": "a cat", "imageKey": "k0.png"}
+    client = _stub_client(_session_doc(iteration_count=1, iterations=[done]))
+    mgr = SessionManager(client, "bucket")
+
+    mgr.fail_iteration("sess-1", "gemini", 0, "timeout")
+
+    assert client.put_object.call_count == 1
+    written = _written(client)[-1]
+    assert written["models"]["gemini"]["iterations"][0]["status"] == "error"
+
+
 # --------------------------------------------------------------------------
 # Errors that are not conflicts
 # --------------------------------------------------------------------------
@@ -409,7 +467,7 @@ def test_create_session_writes_every_key_the_typed_shape_declares():
 
     mgr.create_session("a cat", ["gemini"], owner_id="u1", visibility="private")
 
-    written = json.loads(client.put_object.call_args.kwargs["Body"])
+    written = _written(client)[-1]
     from jobs.manager import SessionState
 
     declared = set(SessionState.__required_keys__) | set(SessionState.__optional_keys__)
@@ -0,0 +1,72 @@
+"""
+The per-model iteration limit as /iterate and /outpaint see it.
+
+SessionManager's own rejection is covered in test_session_manager.py; this is
+the handler-side check in _load_source_image, which reads the session once and
+refuses before any provider is called. Run against a moto-backed
+SessionManager rather than a MagicMock, so the session it reads is the one the
+real add_iteration/complete_iteration calls wrote.
+
+The MiniStack suite keeps one end-to-end pass over the same rule; the loop of
+seven refinements lives here, where each S3 call is in-process.
+"""
+
+import base64
+
+import pytest
+
+from config import MAX_ITERATIONS
+from jobs.manager import SessionManager
+from utils.storage import ImageStorage
+
+
+@pytest.fixture
+def session_manager(mock_s3, monkeypatch):
+    """A moto-backed SessionManager and ImageStorage installed as the
+    handler's singletons, over one bucket."""
+    import lambda_function
+
+    s3, bucket = mock_s3
+    sm = SessionManager(s3, bucket)
+    monkeypatch.setattr(lambda_function, "session_manager", sm)
+    monkeypatch.setattr(lambda_function, "image_storage", ImageStorage(s3, bucket, "cdn.example.com"))
+    return sm
+
+
+def _session_with_iterations(sm, count):
+    """A session whose gemini column has ``count`` completed iterations, each
+    with its image actually stored."""
+    sid = sm.create_session("limit test", ["gemini"])
+    for i in range(count):
+        key = f"sessions/{sid}/gemini-{i}.png"
+        sm.s3.put_object(Bucket=sm.bucket, Key=key, Body=b"png-%d" % i)
+        sm.add_iteration(sid, "gemini", f"prompt {i}")
+        sm.complete_iteration(sid, "gemini", i, key, 1.0)
+    return sid
+
+
+def test_a_model_at_the_limit_is_refused_before_any_image_is_read(session_manager):
+    import lambda_function
+
+    sid = _session_with_iterations(session_manager, MAX_ITERATIONS)
+
+    loaded, error = lambda_function._load_source_image(sid, "gemini")
+
+    assert loaded is None
+    assert error["statusCode"] == 400
+    assert "limit" in error["body"].lower()
+
+
+def test_one_below_the_limit_loads_the_latest_image(session_manager):
+    """The boundary is >=, not >: the last allowed refinement still gets its
+    source, and the source is the newest completed iteration."""
+    import lambda_function
+
+    sid = _session_with_iterations(session_manager, MAX_ITERATIONS - 1)
+
+    loaded, error = lambda_function._load_source_image(sid, "gemini")
+
+    assert error is None
+    image_b64, iteration_count, _ = loaded
+    assert iteration_count == MAX_ITERATIONS - 1
+    assert base64.b64decode(image_b64) == b"png-%d" % (MAX_ITERATIONS - 2)
@@ -5,9 +5,19 @@ Uses moto mock_s3 fixture for real S3 behavior instead of MagicMock.
 Tests assert on observable behavior (data in S3) not call_args.
 """
 
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
 import pytest
 
-from jobs.manager import SessionManager
+from jobs.manager import SessionManager, _utc_now_iso
+
+
+@pytest.fixture
+def mock_s3(moto_s3_bucket):
+    """SessionManager only ever talks to S3: shared backend, bucket per test
+    (see conftest)."""
+    return moto_s3_bucket
 
 
 class TestSessionManager:
@@ -47,6 +57,18 @@ class TestSessionManager:
         assert session["models"]["openai"]["enabled"] is False
         assert session["models"]["openai"]["status"] == "disabled"
 
+    def test_create_session_writes_every_column_in_full(self, session_manager):
+        """Each of the four columns is stored with the same complete shape."""
+        sid = session_manager.create_session("test prompt", ["gemini", "nova"])
+        models = session_manager.get_session(sid)["models"]
+
+        assert models == {
+            "gemini": {"enabled": True, "status": "pending", "iterationCount": 0, "iterations": []},
+            "nova": {"enabled": True, "status": "pending", "iterationCount": 0, "iterations": []},
+            "openai": {"enabled": False, "status": "disabled", "iterationCount": 0, "iterations": []},
+            "firefly": {"enabled": False, "status": "disabled", "iterationCount": 0, "iterations": []},
+        }
+
     def test_get_session_returns_none_for_missing(self, session_manager):
         """get_session() should return None for nonexistent session."""
         result = session_manager.get_session("nonexistent")
@@ -101,6 +123,23 @@ class TestSessionManager:
         assert iteration["status"] == "error"
         assert iteration["error"] == "API error"
 
+    def test_add_failed_iteration_records_a_terminal_row(self, session_manager):
+        """add_failed_iteration() should land an errored iteration in one step."""
+        sid = session_manager.create_session("test", ["gemini"])
+
+        index = session_manager.add_failed_iteration(sid, "gemini", "prompt", "Model is not enabled")
+
+        session = session_manager.get_session(sid)
+        model = session["models"]["gemini"]
+        iteration = model["iterations"][0]
+        assert index == 0
+        assert model["iterationCount"] == 1
+        assert iteration["status"] == "error"
+        assert iteration["error"] == "Model is not enabled"
+        assert iteration["startedAt"] == iteration["completedAt"]
+        assert model["status"] == "error"
+        assert session["status"] == "failed"
+
     def test_get_iteration_count(self, session_manager):
         """get_iteration_count() should return correct count."""
         sid = session_manager.create_session("test", ["gemini"])
@@ -130,3 +169,72 @@ class TestSessionManager:
         session_manager.add_iteration(sid, "gemini", "p3")
 
         assert session_manager.get_latest_image_key(sid, "gemini") == "key-1"
+
+
+class TestUtcNowIso:
+    """The cached timestamp formatter must read back as the moment it stamped."""
+
+    def test_parses_as_an_aware_utc_datetime(self):
+        before = datetime.now(timezone.utc)
+        stamped = datetime.fromisoformat(_utc_now_iso())
+        after = datetime.now(timezone.utc)
+
+        assert stamped.utcoffset() == timedelta(0)
+        assert before - timedelta(milliseconds=1) <= stamped <= after
+
+    def test_the_cached_second_is_not_reused_for_the_next_one(self):
+        base = 1_767_225_599 * 1_000_000_000  # 2025-12-31T23:59:59Z
+        with patch("jobs.manager.time.time_ns", side_effect=[base + 5_000, base + 1_000_000_007]):
+            first = _utc_now_iso()
+            second = _utc_now_iso()
+
+        assert first == "2025-12-31T23:59:59.000005+00:00"
+        assert second == "2026-01-01T00:00:00.000000+00:00"
+
+
+class TestStatusRollup:
+    """Model and session statuses depend only on which statuses are present."""
+
+    @pytest.mark.parametrize(
+        "iteration_statuses, expected",
+        [
+            ([], "pending"),
+            (["completed", "in_progress"], "in_progress"),
+            (["completed", "completed"], "completed"),
+            (["error"], "error"),
+            (["completed", "error"], "partial"),
+        ],
+    )
+    def test_model_status(self, iteration_statuses, expected):
+        column = {
+            "enabled": True,
+            "status": "pending",
+            "iterationCount": len(iteration_statuses),
+            "iterations": [{"index": i, "status": s} for i, s in enumerate(iteration_statuses)],
+        }
+        assert SessionManager(None, "b")._compute_model_status(column) == expected
+
+    def test_disabled_model_status(self):
+        column = {"enabled": False, "status": "disabled", "iterationCount": 0, "iterations": []}
+        assert SessionManager(None, "b")._compute_model_status(column) == "disabled"
+
+    @pytest.mark.parametrize(
+        "model_statuses, expected",
+        [
+            ([], "failed"),
+            (["completed", "in_progress", "pending"], "in_progress"),
+            (["completed", "pending"], "pending"),
+            (["completed", "completed"], "completed"),
+            (["error", "failed"], "failed"),
+            (["completed", "error"], "partial"),
+            (["partial", "completed"], "completed"),
+        ],
+    )
+    def test_session_status(self, model_statuses, expected):
+        models = {
+            f"m{i}": {"enabled": True, "status": s, "iterationCount": 0, "iterations": []}
+            for i, s in enumerate(model_statuses)
+        }
+        models["off"] = {"enabled": False, "status": "disabled", "iterationCount": 0, "iterations": []}
+        session = {"models": models}
+        assert SessionManager(None, "b")._compute_session_status(session) == expected
@@ -12,10 +12,38 @@ from utils.storage import ImageStorage
 
 from .fixtures.api_responses import SAMPLE_IMAGE_BASE64
 
+# Serialized once at import: the gallery listing tests put hundreds of
+# placeholder objects and only care that a key exists, so re-encoding the
+# same dict per put_object was pure overhead.
+_PLACEHOLDER_BODY = json.dumps({'test': 'data'}).encode()
+
+
+@pytest.fixture
+def mock_s3(moto_s3_bucket):
+    """Every test here touches S3 and nothing else, so it runs on the
+    module-shared backend with a bucket of its own (see conftest)."""
+    return moto_s3_bucket
+
+
+def _seed_s3(s3_client, bucket_name, keys_and_bodies):
+    """Put every (key, body) pair into the bucket.
+
+    Serial on purpose: moto is not thread-safe (CONTRIBUTING.md), so a pool of
+    put_object calls would trade a few seconds for an intermittent failure.
+    """
+    for key, body in keys_and_bodies:
+        s3_client.put_object(Bucket=bucket_name, Key=key, Body=body)
+
 
 class TestImageStorage:
     """Tests for ImageStorage class"""
 
+    @pytest.fixture
+    def storage(self, mock_s3):
+        """ImageStorage bound to the moto bucket with the default CDN domain."""
+        s3_client, bucket_name = mock_s3
+        return ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
+
     def test_get_cloudfront_url(self, mock_s3):
         """Test CloudFront URL generation"""
         s3_client, bucket_name = mock_s3
@@ -29,7 +57,7 @@ class TestImageStorage:
         # Implementation adds https:// prefix
         assert url == f'https://{cloudfront_domain}/{key}'
 
-    def test_list_galleries(self, mock_s3):
+    def test_list_galleries(self, mock_s3, storage):
         """Test listing gallery folders"""
         s3_client, bucket_name = mock_s3
 
@@ -37,21 +65,19 @@ class TestImageStorage:
         s3_client.put_object(
             Bucket=bucket_name,
             Key='sessions/2025-11-16-10-00-00/image1.json',
-            Body=json.dumps({'test': 'data'})
+            Body=_PLACEHOLDER_BODY
         )
         s3_client.put_object(
             Bucket=bucket_name,
             Key='sessions/2025-11-15-14-30-00/image2.json',
-            Body=json.dumps({'test': 'data'})
+            Body=_PLACEHOLDER_BODY
         )
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         galleries = storage.list_galleries()
 
         assert len(galleries) == 2
 
-    def test_list_galleries_excludes_session_uuid_folders(self, mock_s3):
+    def test_list_galleries_excludes_session_uuid_folders(self, mock_s3, storage):
         """Test that list_galleries filters out session UUID folders."""
         s3_client, bucket_name = mock_s3
 
@@ -59,7 +85,7 @@ class TestImageStorage:
         s3_client.put_object(
             Bucket=bucket_name,
             Key='sessions/2025-11-16-10-00-00/image1.json',
-            Body=json.dumps({'test': 'data'})
+            Body=_PLACEHOLDER_BODY
         )
         # Create a session UUID folder (should be excluded)
         s3_client.put_object(
@@ -68,14 +94,12 @@ class TestImageStorage:
             Body=json.dumps({'status': 'completed'})
         )
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         galleries = storage.list_galleries()
 
         assert len(galleries) == 1
         assert galleries[0] == '2025-11-16-10-00-00'
 
-    def test_list_gallery_images(self, mock_s3):
+    def test_list_gallery_images(self, mock_s3, storage):
         """Test listing images from a specific gallery"""
         s3_client, bucket_name = mock_s3
 
@@ -93,13 +117,11 @@ class TestImageStorage:
             Body=json.dumps({'model': 'Model 2'})
         )
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         images = storage.list_gallery_images(gallery_id)
 
         assert len(images) == 2
 
-    def test_get_image_metadata(self, mock_s3):
+    def test_get_image_metadata(self, mock_s3, storage):
         """Test retrieving image metadata"""
         s3_client, bucket_name = mock_s3
 
@@ -116,20 +138,16 @@ class TestImageStorage:
             Body=json.dumps(metadata)
         )
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         retrieved = storage.get_image(key)
 
         assert retrieved is not None
         assert retrieved['model'] == 'Test Model'
         assert retrieved['prompt'] == 'test'
 
-    def test_upload_image_to_sessions(self, mock_s3):
+    def test_upload_image_to_sessions(self, mock_s3, storage):
         """Test uploading image to S3 under sessions prefix as raw PNG"""
         s3_client, bucket_name = mock_s3
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         image_data = SAMPLE_IMAGE_BASE64
 
         key = storage.upload_image(
@@ -151,12 +169,8 @@ class TestImageStorage:
         assert response is not None
         assert response['ContentType'] == 'image/png'
 
-    def test_upload_image_without_iteration(self, mock_s3):
+    def test_upload_image_without_iteration(self, storage):
         """Test uploading image without iteration index"""
-        s3_client, bucket_name = mock_s3
-
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         key = storage.upload_image(
             base64_image=SAMPLE_IMAGE_BASE64,
             target='2025-11-16-10-30-00',
@@ -168,43 +182,57 @@ class TestImageStorage:
         assert 'sessions/' in key
         assert 'iter' not in key
 
-    def test_error_handling_invalid_key(self, mock_s3):
+    def test_error_handling_invalid_key(self, storage):
         """Test error handling for invalid S3 keys"""
-        s3_client, bucket_name = mock_s3
-
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         # Try to get non-existent image
         result = storage.get_image('invalid/key.json')
 
         # Should return None or handle gracefully
         assert result is None or isinstance(result, dict)
 
-    def test_list_galleries_pagination(self, mock_s3):
+    def test_list_galleries_pagination(self, mock_s3, storage):
         """Test that list_galleries paginates through >1000 gallery prefixes."""
         s3_client, bucket_name = mock_s3
 
         # Create 1050 gallery folders (need >1000 to trigger pagination)
-        for i in range(1050):
-            h, remainder = divmod(i, 3600)
-            m, s = divmod(remainder, 60)
-            folder_name = f"2025-01-01-{h:02d}-{m:02d}-{s:02d}"
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=f'sessions/{folder_name}/image.json',
-                Body=json.dumps({'test': 'data'})
-            )
-
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
+        folders = (
+            f"2025-01-01-{i // 3600:02d}-{i % 3600 // 60:02d}-{i % 60:02d}"
+            for i in range(1050)
+        )
+        _seed_s3(
+            s3_client,
+            bucket_name,
+            ((f'sessions/{folder}/image.json', _PLACEHOLDER_BODY) for folder in folders),
+        )
+
         galleries = storage.list_galleries()
 
         assert len(galleries) == 1050
 
-    def test_list_galleries_client_error_logged_and_reraised(self, mock_s3):
-        """Test that ClientError is logged and re-raised, not swallowed."""
-        s3_client, bucket_name = mock_s3
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
+    def test_list_galleries_parses_pages_without_s3(self, storage):
+        """Folder parsing, filtering and ordering across a continuation token,
+        against canned list_objects_v2 pages rather than 1000+ moto puts. The
+        moto test above still proves the real pagination contract."""
+        pages = [
+            {
+                'CommonPrefixes': [
+                    {'Prefix': 'sessions/2025-01-01-00-00-01/'},
+                    {'Prefix': 'sessions/3f2504e0-4f89-11d3-9a0c-0305e82c3301/'},
+                ],
+                'IsTruncated': True,
+                'NextContinuationToken': 'page-2',
+            },
+            {'CommonPrefixes': [{'Prefix': 'sessions/2025-01-02-00-00-00/'}]},
+        ]
 
+        with patch.object(storage.s3, 'list_objects_v2', side_effect=pages) as listed:
+            galleries = storage.list_galleries()
+
+        assert galleries == ['2025-01-02-00-00-00', '2025-01-01-00-00-01']
+        assert listed.call_args_list[1].kwargs['ContinuationToken'] == 'page-2'
+
+    def test_list_galleries_client_error_logged_and_reraised(self, storage):
+        """Test that ClientError is logged and re-raised, not swallowed."""
         # Use a non-existent bucket to trigger ClientError
         storage.bucket = 'non-existent-bucket-xyz'
 
@@ -214,29 +242,27 @@ class TestImageStorage:
             mock_logger.error.assert_called_once()
             assert 'Failed to list galleries' in mock_logger.error.call_args[0][0]
 
-    def test_list_gallery_images_pagination(self, mock_s3):
+    def test_list_gallery_images_pagination(self, mock_s3, storage):
         """Test that list_gallery_images paginates through >1000 objects."""
         s3_client, bucket_name = mock_s3
         gallery_id = '2025-11-16-10-00-00'
 
         # Create 1050 image objects
-        for i in range(1050):
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=f'sessions/{gallery_id}/image-{i:06d}.json',
-                Body=json.dumps({'model': f'Model {i}'})
-            )
-
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
+        _seed_s3(
+            s3_client,
+            bucket_name,
+            (
+                (f'sessions/{gallery_id}/image-{i:06d}.json', json.dumps({'model': f'Model {i}'}))
+                for i in range(1050)
+            ),
+        )
+
         images = storage.list_gallery_images(gallery_id)
 
         assert len(images) == 1050
 
-    def test_list_gallery_images_client_error_logged_and_reraised(self, mock_s3):
+    def test_list_gallery_images_client_error_logged_and_reraised(self, storage):
         """Test that ClientError is logged and re-raised, not swallowed."""
-        s3_client, bucket_name = mock_s3
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
-
         # Use a non-existent bucket to trigger ClientError
         storage.bucket = 'non-existent-bucket-xyz'
 
@@ -246,7 +272,7 @@ class TestImageStorage:
             mock_logger.error.assert_called_once()
             assert 'Failed to list gallery images' in mock_logger.error.call_args[0][0]
 
-    def test_list_gallery_images_includes_json_and_png(self, mock_s3):
+    def test_list_gallery_images_includes_json_and_png(self, mock_s3, storage):
         """Test that list_gallery_images returns both .json and .png files."""
         s3_client, bucket_name = mock_s3
         gallery_id = '2025-11-16-10-00-00'
@@ -268,7 +294,6 @@ class TestImageStorage:
             Body=b'some text'
         )
 
-        storage = ImageStorage(s3_client, bucket_name, 'https://cdn.example.com')
         images = storage.list_gallery_images(gallery_id)
 
         assert len(images) == 2
@@ -317,11 +342,11 @@ class TestListGalleriesBound:
 
     @staticmethod
     def _seed(s3_client, bucket_name, count=30):
-        for i in range(count):
-            folder = f"2026-02-01-00-00-{i:02d}"
-            s3_client.put_object(
-                Bucket=bucket_name, Key=f"sessions/{folder}/img.png", Body=b"x"
-            )
+        _seed_s3(
+            s3_client,
+            bucket_name,
+            ((f"sessions/2026-02-01-00-00-{i:02d}/img.png", b"x") for i in range(count)),
+        )
         from utils.storage import ImageStorage
 
         return ImageStorage(s3_client, bucket_name, "cdn.example.com")
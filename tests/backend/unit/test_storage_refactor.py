@@ -6,11 +6,20 @@ import base64
 import json
 from unittest.mock import patch
 
+import pytest
+
 from utils.storage import ImageStorage
 
 from .fixtures.api_responses import SAMPLE_IMAGE_BASE64
 
 
+@pytest.fixture
+def mock_s3(moto_s3_bucket):
+    """ImageStorage is S3 and nothing else: shared backend, bucket per test
+    (see conftest)."""
+    return moto_s3_bucket
+
+
 class TestUploadImageRawPng:
     """Task 1.1: upload_image stores raw PNG bytes."""
 